@@ -1,13 +1,47 @@
 """Interface de linha de comando para ferramentas de pixel art."""
 
+from __future__ import annotations
+
 import argparse
+import functools
+import glob
+import os
+import stat
+import sys
+from io import BytesIO
 from pathlib import Path
-from typing import Callable
-
-from PIL import Image
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Sequence, Tuple
 
 from errors import PixelArtError
-from processing import PixelArtProcessor
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+    from processing import PixelArtProcessor
+
+# Pillow, NumPy e ``processing`` são importados sob demanda nas funções que
+# realmente processam imagens, mantendo ``--help`` e erros de uso rápidos.
+
+_MENU = (
+    "Escolha uma opção:\n"
+    "1 - Pixelizar (corrigir blocos e limpar imagem)\n"
+    "2 - Reduzir (diminuir tamanho da imagem)\n"
+    "3 - Ampliar (aumentar tamanho da imagem)\n"
+    "4 - Aproximar Cores (substituir cores discrepantes)\n"
+    "5 - Verificar Cores (resumo de cores)\n"
+)
+
+_OPCOES_REDUCAO = frozenset({"1", "2"})
+
+
+def _err(mensagem: str) -> None:
+    """Escreve mensagens de erro em stderr, deixando stdout livre para pipelines.
+
+    ``sys.stderr`` é lido a cada chamada, então redirecionamentos feitos depois
+    da importação (``contextlib.redirect_stderr``, testes) são respeitados.
+    """
+
+    print(mensagem, file=sys.stderr)
 
 
 def inteiro_positivo(valor: str) -> int:
@@ -26,10 +60,29 @@ def inteiro_positivo(valor: str) -> int:
     return numero
 
 
+def caminho_expandido(valor: str) -> Path:
+    """Converte o argumento em ``Path`` com ``~`` já expandido para o argparse."""
+
+    return Path(valor).expanduser()
+
+
+def expandir_entrada(caminho: Path) -> List[Path] | None:
+    """Expande ``--input`` quando ele é um padrão glob (``*``, ``?``, ``[``).
+
+    Retorna ``None`` para caminhos comuns, inclusive arquivos existentes cujo
+    nome contenha esses caracteres.
+    """
+
+    texto = os.fspath(caminho)
+    if not any(caractere in texto for caractere in "*?[") or caminho.exists():
+        return None
+    return [Path(item) for item in sorted(glob.glob(texto, recursive=True))]
+
+
 def obter_fator_interativo(opcao: str) -> int | None:
     """Solicita e valida o fator numérico usado pelas transformações."""
 
-    if opcao in ["1", "2"]:
+    if opcao in _OPCOES_REDUCAO:
         fator: str | None = input(
             "Digite o fator de redução (ex.: 2 para 2x): "
         )
@@ -43,191 +96,351 @@ def obter_fator_interativo(opcao: str) -> int | None:
         if fator_int <= 0:
             raise ValueError("Fator deve ser um número positivo.")
     except ValueError as e:
-        print(f"Erro: {e}")
+        _err(f"Erro: {e}")
         return None
 
     return fator_int
 
 
-def executar_interativo() -> None:
-    """Mantém o modo de operação interativa legado."""
-
-    processor = PixelArtProcessor()
-
-    print("Escolha uma opção:")
-    print("1 - Pixelizar (corrigir blocos e limpar imagem)")
-    print("2 - Reduzir (diminuir tamanho da imagem)")
-    print("3 - Ampliar (aumentar tamanho da imagem)")
-    print("4 - Aproximar Cores (substituir cores discrepantes)")
-    print("5 - Verificar Cores (resumo de cores)")
+def _imprimir_resumo_cores(
+    processor: PixelArtProcessor,
+    img: Image.Image,
+    fator: int,
+    destino: Path,
+) -> None:
+    resumo = processor.verificar_cores(img, destino)
+    sys.stdout.write("\n".join(resumo) + "\n")
+
+
+# Opção -> (mensagem inicial, sufixo de saída, extensão, ação, mensagem final)
+_ACOES_INTERATIVAS: Dict[
+    str,
+    Tuple[
+        str,
+        str,
+        str | None,
+        Callable[[PixelArtProcessor, Image.Image, int, Path], object],
+        str,
+    ],
+] = {
+    "1": (
+        "Pixelizando a imagem...",
+        "pixelizado",
+        None,
+        lambda processor, img, fator, destino: processor.pixelizar(
+            img, fator, destino
+        ),
+        "Imagem pixelizada salva como '{destino}'",
+    ),
+    "2": (
+        "Reduzindo a imagem...",
+        "reduzida",
+        None,
+        lambda processor, img, fator, destino: processor.reduzir(
+            img, fator, destino
+        ),
+        "Imagem reduzida salva como '{destino}'",
+    ),
+    "3": (
+        "Ampliando a imagem...",
+        "ampliada",
+        None,
+        lambda processor, img, fator, destino: processor.ampliar(
+            img, fator, destino
+        ),
+        "Imagem ampliada salva como '{destino}'",
+    ),
+    "4": (
+        "Aproximando cores da imagem...",
+        "cores_aproximadas",
+        None,
+        lambda processor, img, fator, destino: processor.aproximar_cores(
+            img, output_path=destino
+        ),
+        "Imagem com cores aproximadas salva como '{destino}'",
+    ),
+    "5": (
+        "Verificando cores da imagem...",
+        "cores",
+        ".txt",
+        _imprimir_resumo_cores,
+        "Resumo de cores salvo em '{destino}'",
+    ),
+}
+
+
+def executar_interativo() -> bool:
+    """Mantém o modo de operação interativa legado.
+
+    Retorna se a operação deu certo (erros já foram informados em stderr).
+    """
+
+    sys.stdout.write(_MENU)
     opcao: str = input("Digite o número da opção (1, 2, 3, 4 ou 5): ")
 
-    if opcao not in ["1", "2", "3", "4", "5"]:
-        print("Opção inválida! Escolha 1, 2, 3, 4 ou 5.")
-        return
+    if opcao not in _ACOES_INTERATIVAS:
+        _err("Opção inválida! Escolha 1, 2, 3, 4 ou 5.")
+        return False
 
-    arquivo_entrada = Path(
+    arquivo_entrada = caminho_expandido(
         input("Digite o nome do arquivo de imagem (ex.: imagem.png): ")
-    ).expanduser()
+    )
 
-    try:
-        img: Image.Image = Image.open(arquivo_entrada)
-    except FileNotFoundError:
-        print(f"Erro: Arquivo '{arquivo_entrada}' não encontrado.")
-        return
-    except Exception as e:  # pragma: no cover - mensagens explícitas
-        print(f"Erro ao abrir a imagem: {e}")
-        return
+    img = carregar_imagem(arquivo_entrada)
+    if img is None:
+        return False
 
     fator_int = obter_fator_interativo(opcao)
     if fator_int is None:
-        return
+        return False
 
+    mensagem_inicial, sufixo, extensao, acao, mensagem_final = (
+        _ACOES_INTERATIVAS[opcao]
+    )
     try:
-        if opcao == "1":
-            print("Pixelizando a imagem...")
-            destino = gerar_caminho_saida(arquivo_entrada, "pixelizado")
-            processor.pixelizar(img, fator_int, destino)
-            print(f"Imagem pixelizada salva como '{destino}'")
-        elif opcao == "2":
-            print("Reduzindo a imagem...")
-            destino = gerar_caminho_saida(arquivo_entrada, "reduzida")
-            processor.reduzir(img, fator_int, destino)
-            print(f"Imagem reduzida salva como '{destino}'")
-        elif opcao == "3":
-            print("Ampliando a imagem...")
-            destino = gerar_caminho_saida(arquivo_entrada, "ampliada")
-            processor.ampliar(img, fator_int, destino)
-            print(f"Imagem ampliada salva como '{destino}'")
-        elif opcao == "4":
-            print("Aproximando cores da imagem...")
-            destino = gerar_caminho_saida(arquivo_entrada, "cores_aproximadas")
-            processor.aproximar_cores(img, output_path=destino)
-            print(f"Imagem com cores aproximadas salva como '{destino}'")
-        elif opcao == "5":
-            print("Verificando cores da imagem...")
-            destino = gerar_caminho_saida(
-                arquivo_entrada, "cores", extensao=".txt"
-            )
-            resumo = processor.verificar_cores(img, destino)
-            for linha in resumo:
-                print(linha)
-            if destino:
-                print(f"Resumo de cores salvo em '{destino}'")
+        print(mensagem_inicial)
+        destino = gerar_caminho_saida(arquivo_entrada, sufixo, extensao=extensao)
+        acao(_CLI.processor, img, fator_int, destino)
+        print(mensagem_final.format(destino=destino))
     except PixelArtError as exc:
-        print(f"Erro durante o processamento: {exc}")
+        _err(f"Erro durante o processamento: {exc}")
+        return False
+    return True
+
+
+def carregar_imagem(caminho: Path | Image.Image) -> Image.Image | None:
+    """Abre a imagem indicada, tratando erros comuns de IO.
 
+    O arquivo é lido de uma só vez e decodificado imediatamente, evitando as
+    leituras pequenas e tardias do ``Image.open`` sobre o arquivo. Imagens já
+    carregadas são devolvidas sem acesso ao disco. Caminhos devem chegar com
+    ``~`` já expandido (ver ``caminho_expandido``).
+    """
 
-def carregar_imagem(caminho: Path) -> Image.Image | None:
-    """Abre a imagem indicada, tratando erros comuns de IO."""
+    from PIL import Image, UnidentifiedImageError
+
+    if isinstance(caminho, Image.Image):
+        return caminho
 
-    caminho = caminho.expanduser()
     try:
-        return Image.open(caminho)
+        # Checagens antes de abrir: ``open`` bloquearia em um FIFO, por exemplo,
+        # antes de chegar à rejeição de arquivos não regulares.
+        info = os.stat(caminho)
+        if stat.S_ISDIR(info.st_mode):
+            _err(f"Erro: '{caminho}' é um diretório, não um arquivo de imagem.")
+            return None
+        if not stat.S_ISREG(info.st_mode):
+            _err(f"Erro: '{caminho}' não é um arquivo regular.")
+            return None
+        if info.st_size == 0:
+            _err(f"Erro: Arquivo '{caminho}' está vazio.")
+            return None
+        with open(caminho, "rb") as arquivo:
+            dados = arquivo.read()
+        imagem = Image.open(BytesIO(dados))
+        imagem.load()
+        return imagem
     except FileNotFoundError:
-        print(f"Erro: Arquivo '{caminho}' não encontrado.")
+        _err(f"Erro: Arquivo '{caminho}' não encontrado.")
+    except UnidentifiedImageError:
+        _err(f"Erro: '{caminho}' não é um arquivo de imagem reconhecido.")
     except Exception as exc:  # pragma: no cover - mensagens explícitas
-        print(f"Erro ao abrir a imagem: {exc}")
+        _err(f"Erro ao abrir a imagem: {exc}")
     return None
 
 
+@functools.lru_cache(maxsize=64)
 def gerar_caminho_saida(
     caminho_entrada: Path, sufixo: str, extensao: str | None = None
 ) -> Path:
-    """Gera automaticamente um caminho de saída baseado no arquivo de entrada."""
+    """Gera automaticamente um caminho de saída baseado no arquivo de entrada.
+
+    Função pura (``Path`` é imutável e hashable), por isso memoizada: chamadas
+    repetidas com os mesmos argumentos não reconstroem o caminho.
+    """
+
+    # Operações de string sobre o caminho em vez de ``stem``/``suffix`` e
+    # ``with_name``, com as mesmas regras de extensão do ``pathlib``.
+    caminho = os.fspath(caminho_entrada)
+    inicio_nome = max(caminho.rfind("/"), caminho.rfind(os.sep)) + 1
+    ponto = caminho.rfind(".")
+    if inicio_nome < ponto < len(caminho) - 1:
+        base, extensao_entrada = caminho[:ponto], caminho[ponto:]
+    else:
+        base, extensao_entrada = caminho, ""
 
-    entrada = caminho_entrada.expanduser()
-    extensao_saida = extensao if extensao is not None else entrada.suffix or ".png"
-    return entrada.with_name(f"{entrada.stem}_{sufixo}{extensao_saida}")
+    extensao_saida = extensao if extensao is not None else extensao_entrada or ".png"
+    return Path(f"{base}_{sufixo}{extensao_saida}")
 
 
-def processar_pixelizar(args: argparse.Namespace) -> None:
-    processor = PixelArtProcessor()
-    imagem = carregar_imagem(args.input)
-    if imagem is None:
-        return
+class Cli:
+    """Handlers dos subcomandos ligados a um único processador compartilhado.
 
-    output = args.output or gerar_caminho_saida(args.input, "pixelizado")
+    Os métodos são registrados como ``handler`` no argparse; qualquer estado
+    mantido pelo processador (caches de paleta, tabelas) sobrevive entre as
+    operações da mesma execução.
+    """
 
-    try:
-        processor.pixelizar(imagem, args.factor, output)
-    except PixelArtError as exc:
-        print(f"Erro ao pixelizar: {exc}")
-        return
+    def __init__(self) -> None:
+        self._processor: PixelArtProcessor | None = None
 
-    print(f"Imagem pixelizada salva como '{output}'")
+    @property
+    def processor(self) -> PixelArtProcessor:
+        """Processador criado sob demanda, evitando importar NumPy/Pillow cedo."""
 
+        if self._processor is None:
+            from processing import PixelArtProcessor
 
-def processar_reduzir(args: argparse.Namespace) -> None:
-    processor = PixelArtProcessor()
-    imagem = carregar_imagem(args.input)
-    if imagem is None:
-        return
+            self._processor = PixelArtProcessor()
+        return self._processor
 
-    output = args.output or gerar_caminho_saida(args.input, "reduzida")
+    def aplicar_opcoes(self, args: argparse.Namespace) -> None:
+        """Repassa ao processador as opções de gravação da linha de comando."""
 
-    try:
-        processor.reduzir(imagem, args.factor, output)
-    except PixelArtError as exc:
-        print(f"Erro ao reduzir: {exc}")
-        return
+        nivel = getattr(args, "compress_level", None)
+        if nivel is not None:
+            self.processor.nivel_compressao = nivel
 
-    print(f"Imagem reduzida salva como '{output}'")
+    def pixelizar(self, args: argparse.Namespace) -> bool:
+        imagem = carregar_imagem(args.input)
+        if imagem is None:
+            return False
 
+        output = args.output or gerar_caminho_saida(args.input, "pixelizado")
 
-def processar_ampliar(args: argparse.Namespace) -> None:
-    processor = PixelArtProcessor()
-    imagem = carregar_imagem(args.input)
-    if imagem is None:
-        return
+        try:
+            self.processor.pixelizar(imagem, args.factor, output)
+        except PixelArtError as exc:
+            _err(f"Erro ao pixelizar: {exc}")
+            return False
 
-    output = args.output or gerar_caminho_saida(args.input, "ampliada")
+        print(f"Imagem pixelizada salva como '{output}'")
+        return True
 
-    try:
-        processor.ampliar(imagem, args.factor, output)
-    except PixelArtError as exc:
-        print(f"Erro ao ampliar: {exc}")
-        return
+    def reduzir(self, args: argparse.Namespace) -> bool:
+        imagem = carregar_imagem(args.input)
+        if imagem is None:
+            return False
 
-    print(f"Imagem ampliada salva como '{output}'")
+        output = args.output or gerar_caminho_saida(args.input, "reduzida")
 
+        try:
+            self.processor.reduzir(imagem, args.factor, output)
+        except PixelArtError as exc:
+            _err(f"Erro ao reduzir: {exc}")
+            return False
 
-def processar_aproximar(args: argparse.Namespace) -> None:
-    processor = PixelArtProcessor()
-    imagem = carregar_imagem(args.input)
-    if imagem is None:
-        return
+        print(f"Imagem reduzida salva como '{output}'")
+        return True
 
-    tolerancia = args.factor if args.factor is not None else 5
-    output = args.output or gerar_caminho_saida(args.input, "cores_aproximadas")
+    def ampliar(self, args: argparse.Namespace) -> bool:
+        imagem = carregar_imagem(args.input)
+        if imagem is None:
+            return False
 
-    try:
-        processor.aproximar_cores(imagem, tolerancia=tolerancia, output_path=output)
-    except PixelArtError as exc:
-        print(f"Erro ao aproximar cores: {exc}")
-        return
+        output = args.output or gerar_caminho_saida(args.input, "ampliada")
 
-    print(f"Imagem com cores aproximadas salva como '{output}'")
+        try:
+            self.processor.ampliar(imagem, args.factor, output)
+        except PixelArtError as exc:
+            _err(f"Erro ao ampliar: {exc}")
+            return False
 
+        print(f"Imagem ampliada salva como '{output}'")
+        return True
 
-def processar_verificar(args: argparse.Namespace) -> None:
-    processor = PixelArtProcessor()
-    imagem = carregar_imagem(args.input)
-    if imagem is None:
-        return
+    def aproximar(self, args: argparse.Namespace) -> bool:
+        imagem = carregar_imagem(args.input)
+        if imagem is None:
+            return False
 
-    output = args.output or gerar_caminho_saida(args.input, "cores", extensao=".txt")
+        tolerancia = args.factor if args.factor is not None else 5
+        output = args.output or gerar_caminho_saida(args.input, "cores_aproximadas")
 
-    try:
-        resumo = processor.verificar_cores(imagem, output)
-    except PixelArtError as exc:
-        print(f"Erro ao verificar cores: {exc}")
-        return
+        try:
+            self.processor.aproximar_cores(
+                imagem, tolerancia=tolerancia, output_path=output
+            )
+        except PixelArtError as exc:
+            _err(f"Erro ao aproximar cores: {exc}")
+            return False
+
+        print(f"Imagem com cores aproximadas salva como '{output}'")
+        return True
+
+    def verificar(self, args: argparse.Namespace) -> bool:
+        imagem = carregar_imagem(args.input)
+        if imagem is None:
+            return False
+
+        output = args.output or gerar_caminho_saida(
+            args.input, "cores", extensao=".txt"
+        )
+
+        try:
+            resumo = self.processor.verificar_cores(imagem, output)
+        except PixelArtError as exc:
+            _err(f"Erro ao verificar cores: {exc}")
+            return False
+
+        resumo.append(f"Resumo de cores salvo em '{output}'")
+        sys.stdout.write("\n".join(resumo) + "\n")
+        return True
+
+
+_CLI = Cli()
+
+
+def _inicializar_trabalhador() -> None:
+    """Usa uma única thread por processo de ``processar_lote``.
+
+    Os arquivos já são divididos entre processos (um por núcleo); se cada um
+    ainda abrisse as threads de ``aproximar_cores``, a máquina teria processos
+    vezes núcleos threads disputando a CPU.
+    """
 
-    for linha in resumo:
-        print(linha)
-    if output:
-        print(f"Resumo de cores salvo em '{output}'")
+    _CLI.processor.trabalhadores = 1
+
+
+def _processar_arquivo(
+    metodo: str, fator: int | None, nivel_compressao: int | None, caminho: Path
+) -> bool:
+    """Executa um subcomando para um único arquivo (tarefa de ``processar_lote``)."""
+
+    args = argparse.Namespace(
+        input=caminho, output=None, factor=fator, compress_level=nivel_compressao
+    )
+    _CLI.aplicar_opcoes(args)
+    return getattr(_CLI, metodo)(args)
+
+
+def processar_lote(
+    caminhos: Iterable[Path],
+    comando: str,
+    fator: int | None = None,
+    processos: int | None = None,
+    nivel_compressao: int | None = None,
+) -> int:
+    """Aplica um subcomando a vários arquivos em paralelo.
+
+    Cada arquivo é independente, então é processado em um processo próprio
+    (por padrão, um por núcleo), com saída derivada do nome de entrada. Um
+    arquivo com erro não interrompe os demais; retorna quantos falharam.
+    """
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    metodo = _SUBCOMANDOS[comando][3]
+    tarefa = functools.partial(_processar_arquivo, metodo, fator, nivel_compressao)
+    caminhos = list(caminhos)
+    processos = min(processos or os.cpu_count() or 1, len(caminhos))
+    if processos <= 1:
+        return sum(not tarefa(caminho) for caminho in caminhos)
+
+    with ProcessPoolExecutor(
+        max_workers=processos, initializer=_inicializar_trabalhador
+    ) as executor:
+        return sum(not sucesso for sucesso in executor.map(tarefa, caminhos))
 
 
 def adicionar_argumentos_comuns(
@@ -238,8 +451,11 @@ def adicionar_argumentos_comuns(
     parser.add_argument(
         "--input",
         required=True,
-        type=Path,
-        help="Caminho do arquivo de imagem de entrada.",
+        type=caminho_expandido,
+        help=(
+            "Caminho do arquivo de imagem de entrada ou padrão glob "
+            "(ex.: 'sprites/*.png') para processar vários arquivos."
+        ),
     )
     ajuda_saida = (
         "Arquivo de saída (opcional; padrão derivado do nome de entrada)."
@@ -249,7 +465,7 @@ def adicionar_argumentos_comuns(
     parser.add_argument(
         "--output",
         default=None,
-        type=Path,
+        type=caminho_expandido,
         help=ajuda_saida,
     )
     parser.add_argument(
@@ -258,10 +474,72 @@ def adicionar_argumentos_comuns(
         default=fator_padrao,
         help="Fator numérico usado na operação.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=inteiro_positivo,
+        default=None,
+        help=(
+            "Processos usados quando --input é um padrão com vários arquivos "
+            "(padrão: núcleos da CPU); ignorado para um único arquivo."
+        ),
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        choices=range(10),
+        default=None,
+        metavar="0-9",
+        help="Nível de compressão PNG (padrão: 1, rápido).",
+    )
 
 
-def construir_parser() -> argparse.ArgumentParser:
-    """Cria o parser principal com subcomandos profissionais."""
+# Subcomando -> (ajuda, sufixo de saída padrão, fator padrão, método de Cli)
+_SUBCOMANDOS: Dict[str, Tuple[str, str, int | None, str]] = {
+    "pixelizar": (
+        "Corrige blocos, reduz e reamplia a imagem pixel art.",
+        "pixelizado",
+        2,
+        "pixelizar",
+    ),
+    "reduzir": (
+        "Reduz a imagem mantendo o estilo pixelado.",
+        "reduzida",
+        2,
+        "reduzir",
+    ),
+    "ampliar": (
+        "Amplia a imagem em múltiplos inteiros sem suavizar os blocos.",
+        "ampliada",
+        2,
+        "ampliar",
+    ),
+    "aproximar-cores": (
+        "Aproxima cores discrepantes usando vizinhança como referência.",
+        "cores_aproximadas",
+        None,
+        "aproximar",
+    ),
+    "verificar-cores": (
+        "Exibe um resumo das cores presentes na imagem.",
+        "cores",
+        None,
+        "verificar",
+    ),
+}
+
+
+@functools.cache
+def construir_parser(comando: str | None = None) -> argparse.ArgumentParser:
+    """Cria o parser principal com subcomandos profissionais.
+
+    Quando ``comando`` é um subcomando conhecido, apenas o subparser dele é
+    registrado; os demais nunca seriam usados nessa execução. Sem comando (ou
+    com ``-h``/opções globais) todos os subcomandos são construídos.
+
+    O parser é memoizado por ``comando``: reutilizá-lo é seguro desde que cada
+    chamada passe ``argv`` explícito para ``parse_args`` (por exemplo,
+    ``construir_parser().parse_args(shlex.split(linha))``).
+    """
 
     parser = argparse.ArgumentParser(
         description="Ferramentas de pixel art com subcomandos especializados.",
@@ -275,65 +553,59 @@ def construir_parser() -> argparse.ArgumentParser:
 
     subparsers = parser.add_subparsers(dest="command", metavar="comando")
 
-    parser_pixelizar = subparsers.add_parser(
-        "pixelizar",
-        help="Corrige blocos, reduz e reamplia a imagem pixel art.",
-    )
-    adicionar_argumentos_comuns(parser_pixelizar, "pixelizado", 2)
-    parser_pixelizar.set_defaults(handler=processar_pixelizar)
-
-    parser_reduzir = subparsers.add_parser(
-        "reduzir",
-        help="Reduz a imagem mantendo o estilo pixelado.",
-    )
-    adicionar_argumentos_comuns(parser_reduzir, "reduzida", 2)
-    parser_reduzir.set_defaults(handler=processar_reduzir)
-
-    parser_ampliar = subparsers.add_parser(
-        "ampliar",
-        help="Amplia a imagem em múltiplos inteiros sem suavizar os blocos.",
-    )
-    adicionar_argumentos_comuns(parser_ampliar, "ampliada", 2)
-    parser_ampliar.set_defaults(handler=processar_ampliar)
-
-    parser_aproximar = subparsers.add_parser(
-        "aproximar-cores",
-        help="Aproxima cores discrepantes usando vizinhança como referência.",
-    )
-    adicionar_argumentos_comuns(
-        parser_aproximar,
-        "cores_aproximadas",
-    )
-    parser_aproximar.set_defaults(handler=processar_aproximar)
-
-    parser_verificar = subparsers.add_parser(
-        "verificar-cores",
-        help="Exibe um resumo das cores presentes na imagem.",
-    )
-    adicionar_argumentos_comuns(parser_verificar, "cores")
-    parser_verificar.set_defaults(handler=processar_verificar)
+    nomes = [comando] if comando in _SUBCOMANDOS else list(_SUBCOMANDOS)
+    for nome in nomes:
+        ajuda, sufixo, fator_padrao, metodo = _SUBCOMANDOS[nome]
+        subparser = subparsers.add_parser(nome, help=ajuda)
+        adicionar_argumentos_comuns(subparser, sufixo, fator_padrao)
+        subparser.set_defaults(handler=getattr(_CLI, metodo))
 
     return parser
 
 
-def main() -> None:
-    """Despacha subcomandos ou inicia o modo interativo legado."""
+def main(argv: Sequence[str] | None = None) -> None:
+    """Despacha subcomandos ou inicia o modo interativo legado (``-I``)."""
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv:
+        # Sem argumentos: mostra o uso sem carregar Pillow nem o modo interativo.
+        construir_parser().print_help()
+        return
 
-    parser = construir_parser()
-    args = parser.parse_args()
+    parser = construir_parser(argv[0])
+    args = parser.parse_args(argv)
 
-    if args.interactive or args.command is None:
-        executar_interativo()
+    if args.interactive:
+        if not executar_interativo():
+            sys.exit(1)
         return
 
-    handler: Callable[[argparse.Namespace], None] | None = getattr(
+    handler: Callable[[argparse.Namespace], bool] | None = getattr(
         args, "handler", None
     )
     if handler is None:
         parser.print_help()
         return
 
-    handler(args)
+    entradas = expandir_entrada(args.input)
+    if entradas is None:
+        _CLI.aplicar_opcoes(args)
+        if not handler(args):
+            # Erros já foram informados em stderr; o status sinaliza a falha.
+            sys.exit(1)
+        return
+
+    if not entradas:
+        _err(f"Erro: Nenhum arquivo corresponde a '{args.input}'.")
+        sys.exit(1)
+    if args.output is not None:
+        _err("Erro: --output não pode ser usado com um padrão de vários arquivos.")
+        sys.exit(1)
+    falhas = processar_lote(
+        entradas, args.command, args.factor, args.jobs, args.compress_level
+    )
+    if falhas:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
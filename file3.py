@@ -1,17 +1,44 @@
 """Ferramentas para manipulação simples de pixel art."""
 
+from importlib import import_module
+from typing import Any
+
 from cli import main
-from processing import PixelArtProcessor
-from utils import cor_referencia_mais_proxima, obter_vizinhos, pixel_fora_da_tolerancia
+
+# Reexportações resolvidas sob demanda para não carregar NumPy/Pillow apenas
+# ao importar o pacote ou executar o ponto de entrada.
+_REEXPORTACOES = {
+    "PixelArtProcessor": "processing",
+    "aguardar_salvamentos": "processing",
+    "cor_referencia_mais_proxima": "utils",
+    "obter_vizinhos": "utils",
+    "pixel_fora_da_tolerancia": "utils",
+    "pixels_fora_da_tolerancia": "utils",
+}
 
 __all__ = [
     "main",
     "PixelArtProcessor",
+    "aguardar_salvamentos",
     "cor_referencia_mais_proxima",
     "obter_vizinhos",
     "pixel_fora_da_tolerancia",
+    "pixels_fora_da_tolerancia",
 ]
 
 
+def __getattr__(nome: str) -> Any:
+    modulo = _REEXPORTACOES.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(import_module(modulo), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
 if __name__ == "__main__":
     main()
@@ -1,5 +1,11 @@
 """Funções de processamento para ferramentas de pixel art."""
 
+import atexit
+import functools
+import math
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -9,8 +15,424 @@ from PIL import Image
 from errors import InvalidParameterError, ProcessingError
 
 
+# "00".."FF" por valor de byte: montar o hexadecimal por consulta evita
+# reinterpretar a especificação de formato a cada cor.
+_HEX: List[str] = [f"{valor:02X}" for valor in range(256)]
+_HEX_ASCII = np.frombuffer("".join(_HEX).encode("ascii"), dtype=np.uint8).reshape(
+    256, 2
+)
+
+
+def _codigos_para_hex(codigos: np.ndarray) -> List[str]:
+    """Formata códigos ``0xRRGGBB`` como ``"#RRGGBB"`` de uma só vez.
+
+    Os 7 caracteres de cada cor são montados em um array de bytes pela tabela
+    ``_HEX_ASCII`` e convertidos em strings em bloco, sem f-string por cor.
+    """
+
+    texto = np.empty((codigos.size, 7), dtype=np.uint8)
+    texto[:, 0] = ord("#")
+    texto[:, 1:3] = _HEX_ASCII[codigos >> 16]
+    texto[:, 3:5] = _HEX_ASCII[(codigos >> 8) & 0xFF]
+    texto[:, 5:7] = _HEX_ASCII[codigos & 0xFF]
+    return texto.view("S7").ravel().astype("U7").tolist()
+
+
+def _empacotar_canais(arr: np.ndarray) -> np.ndarray:
+    """Combina até 4 canais de 8 bits em um código ``uint32`` por pixel.
+
+    Para RGB o resultado é ``0xRRGGBB``. Deslocamentos e ORs são feitos
+    in-place, sem temporários de 32 bits por canal.
+    """
+
+    codigos = arr[..., 0].astype(np.uint32)
+    for canal in range(1, arr.shape[-1]):
+        codigos <<= 8
+        codigos |= arr[..., canal]
+    return codigos
+
+
+# Trecho de pixels examinado por vez em ``_primeiras_ocorrencias``.
+_PIXELS_POR_TRECHO = 1 << 16
+
+
+def _primeiras_ocorrencias(codigos: np.ndarray, valores: np.ndarray) -> np.ndarray:
+    """Índice da primeira ocorrência de cada um dos ``valores`` (ordenados).
+
+    ``np.unique(..., return_index=True)`` precisa de uma ordenação estável de
+    todos os pixels. Aqui os pixels são lidos em trechos, em ordem, e a busca
+    para assim que todas as cores foram vistas, o que em pixel art (poucas
+    cores) costuma acontecer logo no início. Com muitas cores distintas a
+    ordenação completa é mais barata e é usada diretamente.
+    """
+
+    if valores.size * 16 > codigos.size:
+        _, primeiros = np.unique(codigos, return_index=True)
+        return primeiros
+
+    primeiros = np.full(valores.size, -1, dtype=np.intp)
+    faltam = valores.size
+    for inicio in range(0, codigos.size, _PIXELS_POR_TRECHO):
+        trecho, indices = np.unique(
+            codigos[inicio : inicio + _PIXELS_POR_TRECHO], return_index=True
+        )
+        posicoes = np.searchsorted(valores, trecho)
+        novos = primeiros[posicoes] < 0
+        primeiros[posicoes[novos]] = indices[novos] + inicio
+        faltam -= int(np.count_nonzero(novos))
+        if faltam == 0:
+            break
+    return primeiros
+
+
+def _soma_janela_3x3(arr_pad: np.ndarray) -> np.ndarray:
+    """Soma cada janela 3x3 de um array com uma borda de 1 pixel nos dois eixos.
+
+    A soma é separável: 3 termos ao longo das colunas e depois 3 ao longo das
+    linhas, em vez de 9 fatias somadas.
+    """
+
+    linhas = arr_pad[:, :-2] + arr_pad[:, 1:-1]
+    linhas += arr_pad[:, 2:]
+    soma = linhas[:-2] + linhas[1:-1]
+    soma += linhas[2:]
+    return soma
+
+
+def _limiar_quadrado(limiar: float) -> int:
+    """Menor inteiro ``n`` com ``sqrt(n) >= limiar``.
+
+    Permite comparar distâncias ao quadrado (inteiras) sem ``sqrt`` e com o
+    mesmo resultado da comparação em ponto flutuante. Limiares acima da maior
+    distância possível entre cores RGB (incluindo ``inf`` e ``nan``, que nunca
+    são atingidos) viram um valor que nenhuma distância alcança.
+    """
+
+    distancia_maxima = 3 * 255**2
+    if not limiar * limiar <= distancia_maxima:
+        return distancia_maxima + 1
+    n = math.ceil(limiar * limiar)
+    while n > 0 and math.sqrt(n - 1) >= limiar:
+        n -= 1
+    while math.sqrt(n) < limiar:
+        n += 1
+    return n
+
+
+def _dividir_arredondado(dividendo: int, divisor: int) -> int:
+    """``round(dividendo / divisor)`` só com inteiros (empates para o par).
+
+    Dá o mesmo resultado de ``int(round(...))`` sem passar por ``float``.
+    """
+
+    quociente, resto = divmod(dividendo, divisor)
+    dobro = 2 * resto
+    if dobro > divisor or (dobro == divisor and quociente % 2 == 1):
+        quociente += 1
+    return quociente
+
+
+# Cores de referência padrão de ``aproximar_cores`` (preto e branco).
+_CORES_PADRAO: Tuple[Tuple[int, int, int], ...] = ((0, 0, 0), (255, 255, 255))
+
+
+@functools.lru_cache(maxsize=8)
+def _preparar_referencias(
+    cores: Tuple[Tuple[int, int, int], ...], tolerancia: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Arrays derivados das cores de referência, reaproveitados entre chamadas.
+
+    Retorna as cores (``int16``), os limites inferior e superior da tolerância
+    já recortados para a faixa de 8 bits e ``|r|²`` de cada cor, usado na busca
+    da referência mais próxima. Os arrays são somente leitura.
+    """
+
+    refs = np.asarray(cores, dtype=np.int16)
+    base = refs.astype(np.int64)
+    # Diferenças entre int16 nunca passam de 2 ** 16: tolerâncias maiores são
+    # equivalentes e não transbordam o cálculo dos limites.
+    tolerancia = min(tolerancia, 1 << 16)
+    minimo = np.clip(base - tolerancia, 0, 256).astype(np.int16)
+    maximo = np.clip(base + tolerancia, -1, 255).astype(np.int16)
+    norma = np.sum(base * base, axis=1).astype(np.int32)
+    for array in (refs, minimo, maximo, norma):
+        array.setflags(write=False)
+    return refs, minimo, maximo, norma
+
+
+# Pixels por faixa em ``aproximar_cores``: mantém os temporários de cada faixa
+# em poucos MB independentemente do tamanho da imagem.
+_PIXELS_POR_FAIXA = 1 << 18
+
+
+# Elementos da matriz de distâncias (cores distintas x referências) avaliados
+# de cada vez em ``_referencias_mais_proximas``.
+_DISTANCIAS_POR_BLOCO = 1 << 18
+
+
+# Matriz sRGB linear -> XYZ e branco de referência D65.
+_SRGB_PARA_XYZ = np.array(
+    [
+        [0.4124564, 0.3575761, 0.1804375],
+        [0.2126729, 0.7151522, 0.0721750],
+        [0.0193339, 0.1191920, 0.9503041],
+    ]
+)
+_BRANCO_D65 = np.array([0.95047, 1.0, 1.08883])
+
+
+def _rgb_para_lab(rgb: np.ndarray) -> np.ndarray:
+    """Converte cores sRGB de 8 bits (..., 3) para CIELAB (iluminante D65)."""
+
+    canais = np.asarray(rgb, dtype=np.float64) / 255.0
+    linear = np.where(
+        canais > 0.04045, ((canais + 0.055) / 1.055) ** 2.4, canais / 12.92
+    )
+    xyz = (linear @ _SRGB_PARA_XYZ.T) / _BRANCO_D65
+    delta = 6 / 29
+    f = np.where(xyz > delta**3, np.cbrt(xyz), xyz / (3 * delta**2) + 4 / 29)
+    return np.stack(
+        [
+            116 * f[..., 1] - 16,
+            500 * (f[..., 0] - f[..., 1]),
+            200 * (f[..., 1] - f[..., 2]),
+        ],
+        axis=-1,
+    )
+
+
+def _referencias_mais_proximas(
+    cores: np.ndarray,
+    cores_ref_array: np.ndarray,
+    norma: np.ndarray,
+    cores_ref_lab: np.ndarray | None = None,
+) -> np.ndarray:
+    """Índice da referência mais próxima de cada cor (N, 3) em ``int32``.
+
+    Com ``cores_ref_lab`` a distância é medida em CIELAB (ΔE*76) em vez de RGB.
+    """
+
+    # |m - r|² = |m|² - 2 m·r + |r|²; |m|² é igual para todas as referências e
+    # não altera o argmin (nem os empates).
+    if cores_ref_lab is None and len(cores_ref_array) == 2:
+        # Caso padrão (duas referências): r1 vence sse |m - r1|² < |m - r0|²,
+        # isto é, 2 m·(r1 - r0) > |r1|² - |r0|²; um único produto escalar
+        # substitui a matriz de distâncias e o argmin (empate fica com r0).
+        direcao = 2 * (cores_ref_array[1].astype(np.int32) - cores_ref_array[0])
+        return (cores @ direcao > norma[1] - norma[0]).view(np.int8)
+
+    # Com mais referências, a matriz (N, K) é calculada só para as cores
+    # distintas (médias de pixel art se repetem muito) e espalhada de volta
+    # pelo índice inverso de ``np.unique``. ``Image.quantize`` com a
+    # paleta fixa não serve: o cache de paleta do Pillow agrupa cores
+    # próximas e erra a referência mais próxima em ~2% das cores.
+    # As médias de pixels de 8 bits também cabem em 8 bits por canal.
+    codigos = _empacotar_canais(cores.astype(np.uint8))
+    unicos, inverso = np.unique(codigos, return_inverse=True)
+    distintas = np.stack([unicos >> 16, (unicos >> 8) & 0xFF, unicos & 0xFF], axis=1)
+    mais_proximas = np.empty(
+        unicos.size, dtype=np.min_scalar_type(len(cores_ref_array) - 1)
+    )
+    # Com paletas grandes a matriz (U, K) cresceria com o produto; as cores
+    # distintas são avaliadas em blocos para mantê-la em poucos MB.
+    passo = max(1, _DISTANCIAS_POR_BLOCO // len(cores_ref_array))
+    refs_transpostas = cores_ref_array.T.astype(np.int32)
+    for inicio in range(0, unicos.size, passo):
+        bloco = distintas[inicio : inicio + passo]
+        if cores_ref_lab is None:
+            distancias = norma - 2 * (bloco.astype(np.int32) @ refs_transpostas)
+        else:
+            diferenca = _rgb_para_lab(bloco)[:, None, :] - cores_ref_lab
+            distancias = np.einsum("nkc,nkc->nk", diferenca, diferenca)
+        mais_proximas[inicio : inicio + passo] = np.argmin(distancias, axis=1)
+    return mais_proximas[inverso]
+
+
+def _vizinhos_no_eixo(inicio: int, fim: int, tamanho: int) -> np.ndarray:
+    """Quantas posições de ``[i - 1, i + 1]`` existem em ``[0, tamanho)``,
+    para cada ``i`` em ``[inicio, fim)``."""
+
+    posicoes = np.arange(inicio, fim)
+    return np.minimum(posicoes + 1, tamanho - 1) - np.maximum(posicoes - 1, 0) + 1
+
+
+def _aproximar_faixa(
+    arr: np.ndarray,
+    saida: np.ndarray,
+    referencias: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    limiar_quadrado: int,
+    inicio: int,
+    fim: int,
+    cores_ref_lab: np.ndarray | None = None,
+) -> None:
+    """Aproxima as cores das linhas ``[inicio, fim)`` de ``arr`` (uint8 RGB),
+    gravando-as em ``saida`` (as mesmas linhas do array de destino)."""
+
+    cores_ref_array, minimo, maximo, norma = referencias
+    altura, largura, _ = arr.shape
+    topo = max(inicio - 1, 0)
+    base = min(fim + 1, altura)
+    faixa = arr[inicio:fim]
+
+    # Máscara de pixels fora da tolerância em relação às cores de referência,
+    # direto sobre os bytes da faixa (os limites já estão em 0..255). Um laço
+    # por referência e canal acumula em duas máscaras (H, W) reutilizadas, em
+    # vez de materializar o tensor (H, W, K, 3) das comparações. Os canais são
+    # separados uma vez em planos contíguos: comparar a visão intercalada
+    # (passo de 3 bytes) a cada referência é bem mais lento.
+    planos = np.ascontiguousarray(np.moveaxis(faixa, -1, 0))
+    dentro_tolerancia = np.zeros(faixa.shape[:2], dtype=bool)
+    na_referencia = np.empty_like(dentro_tolerancia)
+    comparacao = np.empty_like(dentro_tolerancia)
+    for limite_inferior, limite_superior in zip(minimo, maximo):
+        na_referencia.fill(True)
+        for canal, valores in enumerate(planos):
+            np.greater_equal(valores, limite_inferior[canal], out=comparacao)
+            na_referencia &= comparacao
+            np.less_equal(valores, limite_superior[canal], out=comparacao)
+            na_referencia &= comparacao
+        dentro_tolerancia |= na_referencia
+    fora_tolerancia = ~dentro_tolerancia
+
+    # A faixa vai direto para o destino e só os pixels substituídos são
+    # regravados depois, sem cópia intermediária da faixa.
+    saida[...] = faixa
+    # Só os pixels fora da tolerância podem mudar: os passos seguintes rodam
+    # apenas sobre eles, compactados em vetores (N, 3) por índices planos
+    # (``take`` é bem mais rápido que indexar com a máscara booleana).
+    indices = np.flatnonzero(fora_tolerancia)
+    if indices.size == 0:
+        return
+    linha, coluna = np.divmod(indices, largura)
+
+    # Halo de 1 linha lido da própria imagem; fora dela, borda zerada para
+    # que vizinhos inexistentes não contem.
+    margem = ((1 - (inicio - topo), 1 - (base - fim)), (1, 1))
+    bloco_pad = np.pad(arr[topo:base], margem + ((0, 0),))
+    centro = faixa.reshape(-1, 3).take(indices, axis=0).astype(np.int32)
+
+    if indices.size * 8 < fora_tolerancia.size:
+        # Poucos pixels a corrigir: soma só as 8 vizinhas de cada um, lidas
+        # por deslocamentos fixos no bloco com borda achatado, em vez da
+        # janela 3x3 da faixa inteira.
+        largura_pad = largura + 2
+        posicoes = (linha + 1) * largura_pad + (coluna + 1)
+        plano = bloco_pad.reshape(-1, 3)
+        vizinhos_soma = np.zeros((indices.size, 3), dtype=np.int16)
+        for delta_y in (-1, 0, 1):
+            for delta_x in (-1, 0, 1):
+                if delta_y or delta_x:
+                    deslocamento = delta_y * largura_pad + delta_x
+                    vizinhos_soma += plano.take(posicoes + deslocamento, axis=0)
+    else:
+        # Soma da janela 3x3 da faixa inteira menos o próprio pixel.
+        vizinhos_soma = (
+            _soma_janela_3x3(bloco_pad.astype(np.int16))
+            .reshape(-1, 3)
+            .take(indices, axis=0)
+        )
+        vizinhos_soma -= centro
+
+    # A janela 3x3 recortada nas bordas é um produto: linhas válidas vezes
+    # colunas válidas. Basta um vetor por eixo, sem somar uma máscara 2D.
+    linhas_validas = _vizinhos_no_eixo(inicio, fim, altura)
+    colunas_validas = _vizinhos_no_eixo(0, largura, largura)
+    contagem_vizinhos = linhas_validas[linha] * colunas_validas[coluna] - 1
+
+    cor_media = np.rint(vizinhos_soma / contagem_vizinhos[:, None]).astype(np.int32)
+
+    # Distâncias ao quadrado em int32 (máx. 3 * 255 ** 2), sem sqrt: basta
+    # comparar com o limiar também ao quadrado.
+    diferenca_media = centro - cor_media
+    discrepancia = np.sum(diferenca_media * diferenca_media, axis=1)
+    discrepantes = discrepancia >= limiar_quadrado
+    cor_media = cor_media[discrepantes]
+
+    indices_cor = _referencias_mais_proximas(
+        cor_media, cores_ref_array, norma, cores_ref_lab
+    )
+
+    saida.reshape(-1, 3)[indices[discrepantes]] = cores_ref_array[indices_cor]
+
+
+# Executor compartilhado para gravações em segundo plano, criado sob demanda.
+# Só gravações em andamento ou que falharam ficam registradas: as concluídas
+# com sucesso saem da lista assim que terminam.
+_EXECUTOR_IO: ThreadPoolExecutor | None = None
+_SALVAMENTOS_PENDENTES: List[Future] = []
+_TRAVA_IO = threading.Lock()
+
+
+def _descartar_salvamento_concluido(futuro: Future) -> None:
+    if futuro.cancelled() or futuro.exception() is None:
+        with _TRAVA_IO:
+            if futuro in _SALVAMENTOS_PENDENTES:
+                _SALVAMENTOS_PENDENTES.remove(futuro)
+
+
+def _agendar_salvamento(
+    image: Image.Image, destino: Path, **opcoes: int
+) -> Future:
+    global _EXECUTOR_IO
+    with _TRAVA_IO:
+        if _EXECUTOR_IO is None:
+            _EXECUTOR_IO = ThreadPoolExecutor(max_workers=2)
+            atexit.register(aguardar_salvamentos)
+        futuro = _EXECUTOR_IO.submit(image.save, destino, **opcoes)
+        _SALVAMENTOS_PENDENTES.append(futuro)
+    # Fora da trava: se a gravação já terminou, o callback roda aqui mesmo e
+    # precisa adquiri-la.
+    futuro.add_done_callback(_descartar_salvamento_concluido)
+    return futuro
+
+
+def aguardar_salvamentos() -> None:
+    """Bloqueia até que todas as gravações em segundo plano terminem.
+
+    Raises:
+        ProcessingError: Se alguma gravação falhar.
+    """
+
+    with _TRAVA_IO:
+        pendentes = list(_SALVAMENTOS_PENDENTES)
+        _SALVAMENTOS_PENDENTES.clear()
+    wait(pendentes)
+    for futuro in pendentes:
+        exc = futuro.exception()
+        if exc is not None:
+            raise ProcessingError(f"Não foi possível salvar a imagem: {exc}") from exc
+
+
 class PixelArtProcessor:
-    """Processador de pixel art com operações de manipulação de imagem."""
+    """Processador de pixel art com operações de manipulação de imagem.
+
+    Com ``salvar_em_segundo_plano=True`` as operações devolvem a imagem sem
+    esperar a codificação PNG; use :func:`aguardar_salvamentos` para garantir
+    que os arquivos foram gravados (isso também ocorre ao encerrar o processo).
+
+    ``nivel_compressao`` (0 a 9) é repassado ao codificador PNG; o padrão 1
+    grava bem mais rápido que o 6 do Pillow, com arquivos pouco maiores (pixel
+    art comprime bem mesmo assim).
+
+    ``trabalhadores`` limita as threads usadas por ``aproximar_cores`` (padrão:
+    uma por núcleo); use 1 quando vários processadores já rodam em paralelo.
+    """
+
+    def __init__(
+        self,
+        salvar_em_segundo_plano: bool = False,
+        nivel_compressao: int = 1,
+        trabalhadores: int | None = None,
+    ) -> None:
+        if not isinstance(nivel_compressao, int) or not 0 <= nivel_compressao <= 9:
+            raise InvalidParameterError(
+                "O parâmetro 'nivel_compressao' precisa ser um inteiro de 0 a 9."
+            )
+        if trabalhadores is not None:
+            self._ensure_positive_int("trabalhadores", trabalhadores)
+        self.salvar_em_segundo_plano = salvar_em_segundo_plano
+        self.nivel_compressao = nivel_compressao
+        self.trabalhadores = trabalhadores
 
     @staticmethod
     def _ensure_positive_int(nome: str, valor: int) -> None:
@@ -40,27 +462,55 @@ class PixelArtProcessor:
         return img
 
     @staticmethod
-    def _save_image(image: Image.Image, output_path: str | Path) -> None:
+    def _como_rgb(img: Image.Image) -> Image.Image:
+        """Converte para RGB; imagens já em RGB são usadas sem a cópia que
+        ``convert("RGB")`` faria."""
+
+        return img if img.mode == "RGB" else img.convert("RGB")
+
+    @staticmethod
+    def _redimensionar(img: Image.Image, tamanho: Tuple[int, int]) -> Image.Image:
+        """Reamostra com ``NEAREST`` apenas quando o tamanho realmente muda."""
+
+        if img.size == tamanho:
+            return img
+        return img.resize(tamanho, Image.NEAREST)
+
+    def _save_image(self, image: Image.Image, output_path: str | Path) -> None:
         destino = Path(output_path)
         try:
             destino.parent.mkdir(parents=True, exist_ok=True)
-            image.save(destino)
+            if self.salvar_em_segundo_plano:
+                # Cópia para que o chamador possa alterar a imagem devolvida.
+                _agendar_salvamento(
+                    image.copy(), destino, compress_level=self.nivel_compressao
+                )
+                return
+            image.save(destino, compress_level=self.nivel_compressao)
         except OSError as exc:  # pragma: no cover - dependente do sistema de arquivos
             raise ProcessingError(
                 f"Não foi possível salvar a imagem em '{destino}': {exc}"
             ) from exc
 
     def calcular_blocos(self, img: Image.Image) -> Tuple[int, int, int]:
-        """Retorna a largura, altura e tamanho médio dos blocos de pixel art."""
+        """Retorna a largura, altura e tamanho médio dos blocos de pixel art.
+
+        A imagem é lida com ``np.asarray``, sem cópia extra além da conversão
+        para RGB quando necessária.
+        """
 
-        img = self._ensure_image_has_data(img).convert("RGB")
-        arr: np.ndarray = np.array(img)
+        img = self._como_rgb(self._ensure_image_has_data(img))
+        arr = np.asarray(img)
         if arr.size == 0:
             raise ProcessingError("A imagem não contém dados para processamento.")
+        if arr.ndim == 3 and arr.dtype == np.uint8 and arr.shape[2] <= 4:
+            # Empacota uma vez para os dois eixos: cada ``detectar_tamanho``
+            # compara direto os códigos ``uint32``.
+            arr = _empacotar_canais(arr)
 
         bloco_largura: int = self.detectar_tamanho(arr, 1)
         bloco_altura: int = self.detectar_tamanho(arr, 0)
-        bloco_tamanho: int = int(round((bloco_largura + bloco_altura) / 2))
+        bloco_tamanho: int = _dividir_arredondado(bloco_largura + bloco_altura, 2)
 
         return bloco_largura, bloco_altura, bloco_tamanho
 
@@ -68,10 +518,10 @@ class PixelArtProcessor:
     def detectar_tamanho(bw: np.ndarray, axis: int) -> int:
         """Calcula o tamanho médio de blocos consecutivos de pixels iguais.
 
-        Percorre o array de imagem, trocando o eixo analisado para avaliar linhas
-        ou colunas conforme `axis`, e mede sequências de pixels idênticos. A média
-        dessas sequências é arredondada para obter o tamanho característico de
-        blocos homogêneos.
+        Compara, de forma vetorizada, pixels adjacentes ao longo de linhas ou
+        colunas conforme `axis` para contar as sequências de pixels idênticos. A
+        média dessas sequências é arredondada para obter o tamanho
+        característico de blocos homogêneos.
 
         Args:
             bw: Array NumPy representando a imagem, com dimensões (H, W, C).
@@ -85,27 +535,31 @@ class PixelArtProcessor:
         if bw.size == 0:
             raise ProcessingError("A imagem convertida está vazia.")
 
-        tamanhos: List[int] = []
-        for linha in np.swapaxes(bw, 0, axis):
-            contagem = 0
-            ultimo_pixel = linha[0]
-            for pixel in linha:
-                if np.any(pixel != ultimo_pixel):
-                    if contagem > 0:
-                        tamanhos.append(contagem)
-                    contagem = 1
-                    ultimo_pixel = pixel
-                else:
-                    contagem += 1
-            if contagem > 0:
-                tamanhos.append(contagem)
-
-        if not tamanhos:
-            raise ProcessingError(
-                "Não foi possível detectar o tamanho dos blocos na imagem fornecida."
-            )
-
-        return int(round(np.mean(tamanhos)))
+        # Cada linha começa uma sequência e cada troca de cor entre pixels
+        # adjacentes inicia outra; como as sequências cobrem a linha inteira, a
+        # média é o total de pixels dividido pelo número de sequências.
+        if bw.ndim == 3 and bw.dtype == np.uint8 and bw.shape[2] <= 4:
+            # Um código inteiro por pixel: todas as linhas são comparadas de uma
+            # vez com uma única comparação por par de pixels.
+            bw = _empacotar_canais(bw)
+
+        linhas = np.swapaxes(bw, 0, axis)
+        atuais, anteriores = linhas[:, 1:], linhas[:, :-1]
+        if linhas.ndim == 2:
+            diferentes = atuais != anteriores
+        else:
+            # Um canal por vez com OR in-place: evita o temporário (N, M, C) e a
+            # redução ``np.any`` sobre um eixo de tamanho 3.
+            diferentes = atuais[..., 0] != anteriores[..., 0]
+            for canal in range(1, linhas.shape[2]):
+                diferentes |= atuais[..., canal] != anteriores[..., canal]
+
+        quantidade_linhas, comprimento = linhas.shape[:2]
+        quantidade_sequencias = quantidade_linhas + int(np.count_nonzero(diferentes))
+
+        return _dividir_arredondado(
+            quantidade_linhas * comprimento, quantidade_sequencias
+        )
 
     def pixelizar(
         self,
@@ -137,18 +591,21 @@ class PixelArtProcessor:
         nova_largura: int = int(round(img.width / bloco_largura * bloco_tamanho))
         nova_altura: int = int(round(img.height / bloco_altura * bloco_tamanho))
 
-        corrigida: Image.Image = img.resize(
-            (nova_largura, nova_altura),
-            Image.NEAREST,
-        )
-        reduzida: Image.Image = corrigida.resize(
+        # Etapas cujo tamanho de destino é o próprio tamanho de origem (blocos
+        # quadrados, fator 1) são puladas em vez de copiar a imagem inteira.
+        # As demais não podem ser fundidas: redimensionamentos NEAREST não se
+        # compõem, e reduzir direto de ``img`` escolheria outros pixels.
+        corrigida: Image.Image = self._redimensionar(img, (nova_largura, nova_altura))
+        reduzida: Image.Image = self._redimensionar(
+            corrigida,
             (
                 corrigida.width // fator_reducao,
                 corrigida.height // fator_reducao,
             ),
-            Image.NEAREST,
         )
-        final: Image.Image = reduzida.resize(corrigida.size, Image.NEAREST)
+        final: Image.Image = self._redimensionar(reduzida, corrigida.size)
+        if final is img:
+            final = img.copy()
         self._save_image(final, output_path)
 
         return final
@@ -161,9 +618,8 @@ class PixelArtProcessor:
     ) -> Image.Image:
         """Reduz uma imagem mantendo a estética pixelada.
 
-        Converte a imagem para array, estima o tamanho dos blocos e ajusta as
-        dimensões preservando o modo `NEAREST`. Em seguida, reduz pelas proporções
-        fornecidas e salva o resultado.
+        Reduz largura e altura pelo fator informado usando reamostragem
+        `NEAREST`, que preserva os blocos, e salva o resultado.
 
         Args:
             img: Imagem PIL original.
@@ -176,15 +632,11 @@ class PixelArtProcessor:
         img = self._ensure_image_has_data(img)
 
         # === Reduzir (Código 2) ===
-        nova_largura: int = img.width
-        nova_altura: int = img.height
-        corrigida: Image.Image = img.resize(
-            (nova_largura, nova_altura),
-            Image.NEAREST,
-        )
+        # Não usar ``Image.reduce``: ele faz média dos blocos e criaria cores
+        # novas, enquanto NEAREST apenas escolhe um pixel de cada bloco.
         largura_reduzida: int = img.width // fator_reducao
         altura_reduzida: int = img.height // fator_reducao
-        reduzida: Image.Image = corrigida.resize(
+        reduzida: Image.Image = img.resize(
             (largura_reduzida, altura_reduzida),
             Image.NEAREST,
         )
@@ -215,15 +667,9 @@ class PixelArtProcessor:
         img = self._ensure_image_has_data(img)
 
         # === Ampliar (Código 3) ===
-        nova_largura: int = img.width
-        nova_altura: int = img.height
-        corrigida: Image.Image = img.resize(
-            (nova_largura, nova_altura),
-            Image.NEAREST,
-        )
         largura_ampliada: int = img.width * fator_aumento
         altura_ampliada: int = img.height * fator_aumento
-        ampliada: Image.Image = corrigida.resize(
+        ampliada: Image.Image = img.resize(
             (largura_ampliada, altura_ampliada),
             Image.NEAREST,
         )
@@ -234,10 +680,11 @@ class PixelArtProcessor:
     def aproximar_cores(
         self,
         img: Image.Image,
-        cores_referencia: List[Tuple[int, int, int]] | None = None,
+        cores_referencia: List[Tuple[int, int, int]] | np.ndarray | None = None,
         tolerancia: int = 5,
         limiar_discrepancia: float = 0.75,
         output_path: str | Path = "pixel_art_cores_aproximadas.png",
+        espaco_cor: str = "rgb",
     ) -> Image.Image:
         """Aproxima cores discrepantes usando vizinhança como referência.
 
@@ -249,11 +696,16 @@ class PixelArtProcessor:
 
         Args:
             img: Imagem PIL de entrada.
-            cores_referencia: Lista de cores RGB usadas como alvo de aproximação.
+            cores_referencia: Cores RGB usadas como alvo de aproximação, como
+                lista de tuplas ou array ``(K, 3)``.
             tolerancia: Desvio máximo permitido para considerar um pixel próximo
                 das cores de referência.
             limiar_discrepancia: Distância mínima em relação à cor média dos
                 vizinhos para que a substituição de cor ocorra.
+            espaco_cor: ``"rgb"`` ou ``"lab"``; com ``"lab"`` a referência mais
+                próxima da cor média é escolhida pela distância em CIELAB,
+                perceptualmente mais uniforme. Tolerância e limiar continuam
+                medidos em RGB.
 
         Returns:
             Imagem PIL com cores aproximadas às referências fornecidas.
@@ -264,69 +716,142 @@ class PixelArtProcessor:
             raise InvalidParameterError(
                 "A lista de cores de referência não pode estar vazia."
             )
+        if espaco_cor not in ("rgb", "lab"):
+            raise InvalidParameterError(
+                "O parâmetro 'espaco_cor' precisa ser 'rgb' ou 'lab'."
+            )
 
-        img = self._ensure_image_has_data(img).convert("RGB")
-        cores_referencia = (
-            cores_referencia
-            if cores_referencia is not None
-            else [(0, 0, 0), (255, 255, 255)]
-        )
+        img = self._como_rgb(self._ensure_image_has_data(img))
+        if cores_referencia is None:
+            chave_referencias = _CORES_PADRAO
+        else:
+            if isinstance(cores_referencia, np.ndarray):
+                # ``tolist`` converte o array inteiro em C, já em ints do Python.
+                cores_referencia = cores_referencia.tolist()
+            chave_referencias = tuple(
+                tuple(int(c) for c in cor) for cor in cores_referencia
+            )
+        referencias = _preparar_referencias(chave_referencias, tolerancia)
 
         # === Aproximar Cores (Melhorada) ===
-        arr: np.ndarray = np.array(img, dtype=np.uint8)
+        arr: np.ndarray = np.asarray(img, dtype=np.uint8)
         if arr.size == 0:
             raise ProcessingError("A imagem não contém dados para processamento.")
 
-        cores_ref_array: np.ndarray = np.asarray(cores_referencia, dtype=np.int16)
-        arr_int: np.ndarray = arr.astype(np.int16, copy=False)
-
-        # Máscara de pixels fora da tolerância em relação às cores de referência
-        diff_ref = np.abs(arr_int[..., None, :] - cores_ref_array[None, None, :, :])
-        dentro_tolerancia = np.all(diff_ref <= tolerancia, axis=3)
-        fora_tolerancia = ~np.any(dentro_tolerancia, axis=2)
-
+        # Processa faixas de linhas para limitar os temporários (H, W, K, 3) ao
+        # tamanho de uma faixa; cada faixa lê 1 linha de halo de cada lado.
         altura, largura, _ = arr.shape
-        arr_pad = np.pad(arr_int, ((1, 1), (1, 1), (0, 0)), mode="edge")
-        mask_pad = np.pad(np.ones((altura, largura), dtype=np.int16), 1, mode="constant")
-
-        vizinhos_soma = (
-            arr_pad[:-2, :-2] * mask_pad[:-2, :-2, None]
-            + arr_pad[:-2, 1:-1] * mask_pad[:-2, 1:-1, None]
-            + arr_pad[:-2, 2:] * mask_pad[:-2, 2:, None]
-            + arr_pad[1:-1, :-2] * mask_pad[1:-1, :-2, None]
-            + arr_pad[1:-1, 2:] * mask_pad[1:-1, 2:, None]
-            + arr_pad[2:, :-2] * mask_pad[2:, :-2, None]
-            + arr_pad[2:, 1:-1] * mask_pad[2:, 1:-1, None]
-            + arr_pad[2:, 2:] * mask_pad[2:, 2:, None]
-        )
-        contagem_vizinhos = (
-            mask_pad[:-2, :-2]
-            + mask_pad[:-2, 1:-1]
-            + mask_pad[:-2, 2:]
-            + mask_pad[1:-1, :-2]
-            + mask_pad[1:-1, 2:]
-            + mask_pad[2:, :-2]
-            + mask_pad[2:, 1:-1]
-            + mask_pad[2:, 2:]
+        linhas_por_faixa = max(1, _PIXELS_POR_FAIXA // largura)
+        faixas = [
+            (inicio, min(inicio + linhas_por_faixa, altura))
+            for inicio in range(0, altura, linhas_por_faixa)
+        ]
+        arr_novo = np.empty_like(arr)
+        limiar_quadrado = _limiar_quadrado(limiar_discrepancia)
+        cores_ref_lab = (
+            _rgb_para_lab(referencias[0]) if espaco_cor == "lab" else None
         )
 
-        cor_media = np.rint(vizinhos_soma / contagem_vizinhos[..., None]).astype(np.int16)
+        def processar(faixa: Tuple[int, int]) -> None:
+            inicio, fim = faixa
+            _aproximar_faixa(
+                arr,
+                arr_novo[inicio:fim],
+                referencias,
+                limiar_quadrado,
+                inicio,
+                fim,
+                cores_ref_lab,
+            )
 
-        discrepancia = np.sqrt(np.sum((arr_int - cor_media) ** 2, axis=2))
-        mascara_discrepante = discrepancia >= limiar_discrepancia
+        # As faixas são independentes e o NumPy libera o GIL nas operações
+        # vetoriais, então threads bastam para usar vários núcleos.
+        trabalhadores = min(len(faixas), self.trabalhadores or os.cpu_count() or 1)
+        if trabalhadores > 1:
+            with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+                list(executor.map(processar, faixas))
+        else:
+            for faixa in faixas:
+                processar(faixa)
+
+        img_final: Image.Image = Image.fromarray(arr_novo)
+        self._save_image(img_final, output_path)
+        return img_final
 
-        distancias = np.sum((cor_media[..., None, :] - cores_ref_array[None, None, :, :]) ** 2, axis=3)
-        indices_cor = np.argmin(distancias, axis=2)
+    @staticmethod
+    def _contar_cores_paleta(img: Image.Image) -> Dict[str, int]:
+        paleta = np.zeros(768, dtype=np.uint8)
+        valores_paleta = (img.getpalette() or [])[:768]
+        paleta[: len(valores_paleta)] = valores_paleta
+        indices = np.asarray(img).ravel()
+        contagens_indice = np.asarray(img.histogram()[:256], dtype=np.int64)
+        usados = np.flatnonzero(contagens_indice)
+        primeiros_indice = _primeiras_ocorrencias(indices, usados)
+
+        # Índices diferentes podem apontar para a mesma cor: as contagens são
+        # somadas e a primeira ocorrência da cor é a menor entre eles.
+        valores, inverso = np.unique(
+            _empacotar_canais(paleta.reshape(256, 3)[usados]), return_inverse=True
+        )
+        contagens = np.zeros(valores.size, dtype=np.int64)
+        np.add.at(contagens, inverso, contagens_indice[usados])
+        primeiros = np.full(valores.size, indices.size, dtype=np.intp)
+        np.minimum.at(primeiros, inverso, primeiros_indice)
+
+        # Mesma ordem do caminho RGB: contagem decrescente e, nos empates,
+        # ordem de primeira ocorrência.
+        ordem = np.lexsort((primeiros, -contagens))
+        return dict(
+            zip(_codigos_para_hex(valores[ordem]), contagens[ordem].tolist())
+        )
 
-        arr_novo = arr.copy()
-        mascara_final = fora_tolerancia & mascara_discrepante
-        if np.any(mascara_final):
-            coords_y, coords_x = np.nonzero(mascara_final)
-            arr_novo[coords_y, coords_x] = cores_ref_array[indices_cor[coords_y, coords_x]]
+    @staticmethod
+    def _contar_cores_rgb(img: Image.Image) -> Dict[str, int]:
+        # === Verificar Cores (Corrigida com conversão para RGB) ===
+        if img.width == 0 or img.height == 0:
+            raise ProcessingError("A imagem não contém dados para processamento.")
 
-        img_final: Image.Image = Image.fromarray(arr_novo.astype(np.uint8))
-        self._save_image(img_final, output_path)
-        return img_final
+        # A imagem é contada em faixas de linhas: a conversão, os códigos e a
+        # ordenação de cada faixa cabem no cache, e a memória extra não cresce
+        # com a imagem inteira. Os resultados parciais (só cores distintas)
+        # são combinados no fim.
+        largura, altura = img.size
+        linhas_por_faixa = max(1, _PIXELS_POR_FAIXA // largura)
+        parciais = []
+        for inicio in range(0, altura, linhas_por_faixa):
+            faixa = img.crop(
+                (0, inicio, largura, min(inicio + linhas_por_faixa, altura))
+            )
+            # Em RGBX cada pixel ocupa 4 bytes R, G, B, X: lidos como uint32
+            # big-endian e deslocados 8 bits, viram direto o código 0xRRGGBB.
+            codigos = np.frombuffer(
+                faixa.convert("RGBX").tobytes(), dtype=">u4"
+            ).astype(np.uint32)
+            codigos >>= 8
+            # ``np.unique`` conta tudo em C; só as cores distintas são
+            # formatadas em hexadecimal.
+            valores, contagens = np.unique(codigos, return_counts=True)
+            primeiros = _primeiras_ocorrencias(codigos, valores) + inicio * largura
+            parciais.append((valores, contagens, primeiros))
+
+        if len(parciais) == 1:
+            valores, contagens, primeiros = parciais[0]
+        else:
+            valores, inverso = np.unique(
+                np.concatenate([parcial[0] for parcial in parciais]),
+                return_inverse=True,
+            )
+            contagens = np.zeros(valores.size, dtype=np.int64)
+            np.add.at(contagens, inverso, np.concatenate([p[1] for p in parciais]))
+            primeiros = np.full(valores.size, img.width * img.height, dtype=np.intp)
+            np.minimum.at(primeiros, inverso, np.concatenate([p[2] for p in parciais]))
+
+        # Já na ordem do resumo: contagem decrescente e, nos empates, ordem de
+        # primeira ocorrência, sem ordenar os itens do dicionário em Python.
+        ordem = np.lexsort((primeiros, -contagens))
+        return dict(
+            zip(_codigos_para_hex(valores[ordem]), contagens[ordem].tolist())
+        )
 
     def verificar_cores(
         self, img: Image.Image, output_path: str | Path | None = None
@@ -334,7 +859,9 @@ class PixelArtProcessor:
         """Conta e exibe a ocorrência de cada cor em uma imagem.
 
         Converte a imagem para RGB, contabiliza cada pixel transformando-o em
-        hexadecimal e imprime um resumo ordenado por frequência.
+        hexadecimal e imprime um resumo ordenado por frequência. Imagens
+        paletizadas (modo ``P``) são contadas pelo histograma de índices e pela
+        paleta, sem decodificar os pixels.
 
         Args:
             img: Imagem PIL a ser analisada.
@@ -347,37 +874,21 @@ class PixelArtProcessor:
                 "O caminho de saída deve ser uma string, um Path ou None."
             )
 
-        # === Verificar Cores (Corrigida com conversão para RGB) ===
-        # Converter a imagem para RGB para garantir 3 canais
-        img = self._ensure_image_has_data(img).convert("RGB")
-        arr: np.ndarray = np.array(img)
-        if arr.size == 0:
-            raise ProcessingError("A imagem não contém dados para processamento.")
-
-        height, width, _ = arr.shape
-        cor_contagem: Dict[str, int] = {}
-
-        # Função para converter RGB para hexadecimal
-        def rgb_to_hex(rgb: Tuple[int, int, int]) -> str:
-            """Converte um valor RGB para sua representação hexadecimal."""
-            return f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'.upper()
-
-        # Contar cada pixel individualmente
-        for y in range(height):
-            for x in range(width):
-                pixel: Tuple[int, int, int] = tuple(arr[y, x])
-                hex_cor: str = rgb_to_hex(pixel)
-                cor_contagem[hex_cor] = cor_contagem.get(hex_cor, 0) + 1
-
-        # Resumo final, ordenado por contagem decrescente
+        img = self._ensure_image_has_data(img)
+        if img.mode == "P":
+            # Imagens paletizadas: o histograma de índices (256 contagens) e a
+            # paleta bastam, sem decodificar cada pixel para RGB.
+            cor_contagem = self._contar_cores_paleta(img)
+        else:
+            cor_contagem = self._contar_cores_rgb(img)
+
+        # Resumo final, ordenado por contagem decrescente (os contadores já
+        # devolvem as cores nessa ordem)
         linhas_resumo = ["Resumo de cores na imagem:"]
-        for hex_cor, contagem in sorted(
-            cor_contagem.items(),
-            key=lambda item: item[1],
-            reverse=True,
-        ):
-            linha = f"{hex_cor} se repetiu {contagem} vezes"
-            linhas_resumo.append(linha)
+        linhas_resumo.extend(
+            f"{hex_cor} se repetiu {contagem} vezes"
+            for hex_cor, contagem in cor_contagem.items()
+        )
 
         if output_path:
             destino = Path(output_path)
@@ -0,0 +1,217 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import cli
+
+
+def test_missing_file_reports_on_stderr_and_fails(tmp_path, capsys):
+    ausente = tmp_path / "nao_existe.png"
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["reduzir", "--input", str(ausente)])
+
+    saida = capsys.readouterr()
+    assert excinfo.value.code == 1
+    assert saida.out == ""
+    assert "não encontrado" in saida.err
+
+
+def test_invalid_argument_exits_with_usage_error(capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["reduzir", "--input", "x.png", "--factor", "0"])
+
+    saida = capsys.readouterr()
+    assert excinfo.value.code == 2
+    assert saida.out == ""
+    assert "O fator deve ser maior que zero." in saida.err
+
+
+def test_success_reports_on_stdout(tmp_path, capsys):
+    entrada = tmp_path / "sprite.png"
+    Image.fromarray(np.zeros((4, 4, 3), dtype=np.uint8)).save(entrada)
+
+    cli.main(["reduzir", "--input", str(entrada), "--factor", "2"])
+
+    saida = capsys.readouterr()
+    assert saida.err == ""
+    assert "sprite_reduzida.png" in saida.out
+    assert (tmp_path / "sprite_reduzida.png").exists()
+
+
+def _salvar_sprites(pasta, nomes):
+    for nome in nomes:
+        Image.fromarray(np.zeros((4, 4, 3), dtype=np.uint8)).save(pasta / nome)
+
+
+def test_expandir_entrada_globs_only_patterns(tmp_path):
+    _salvar_sprites(tmp_path, ["b.png", "a.png", "[x].png"])
+
+    assert cli.expandir_entrada(tmp_path / "a.png") is None
+    assert cli.expandir_entrada(tmp_path / "[x].png") is None
+    assert cli.expandir_entrada(tmp_path / "?.png") == [tmp_path / "a.png", tmp_path / "b.png"]
+    assert cli.expandir_entrada(tmp_path / "*.gif") == []
+
+
+def test_batch_without_matches_fails(tmp_path, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["reduzir", "--input", str(tmp_path / "*.png")])
+
+    assert excinfo.value.code == 1
+    assert "Nenhum arquivo corresponde" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_batch_keeps_going_after_bad_file(tmp_path, capsys, jobs):
+    _salvar_sprites(tmp_path, ["a.png", "c.png"])
+    (tmp_path / "b.png").write_bytes(b"nao sou uma imagem")
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["reduzir", "--input", str(tmp_path / "*.png"), "--jobs", jobs])
+
+    assert excinfo.value.code == 1
+    assert (tmp_path / "a_reduzida.png").exists()
+    assert (tmp_path / "c_reduzida.png").exists()
+    assert not (tmp_path / "b_reduzida.png").exists()
+    if jobs == "1":
+        assert "não é um arquivo de imagem reconhecido" in capsys.readouterr().err
+
+
+def test_batch_success_exits_normally(tmp_path):
+    _salvar_sprites(tmp_path, ["a.png", "b.png"])
+
+    cli.main(["ampliar", "--input", str(tmp_path / "*.png"), "--jobs", "2"])
+
+    assert (tmp_path / "a_ampliada.png").exists()
+    assert (tmp_path / "b_ampliada.png").exists()
+
+
+def test_batch_workers_use_a_single_thread(monkeypatch):
+    monkeypatch.setattr(cli._CLI, "_processor", None)
+
+    cli._inicializar_trabalhador()
+
+    assert cli._CLI.processor.trabalhadores == 1
+
+
+@pytest.mark.parametrize(
+    ("entrada", "esperada"),
+    [
+        ("sprite.png", "sprite_cores.png"),
+        ("noext", "noext_cores.png"),
+        (".hidden", ".hidden_cores.png"),
+        (".hidden.png", ".hidden_cores.png"),
+        ("a.b.c.png", "a.b.c_cores.png"),
+        ("x.", "x._cores.png"),
+        ("dir.v2/sprite", "dir.v2/sprite_cores.png"),
+        ("dir.d/.cfg", "dir.d/.cfg_cores.png"),
+        ("/abs/sub/sprite.tar.gz", "/abs/sub/sprite.tar_cores.gz"),
+    ],
+)
+def test_gerar_caminho_saida_matches_pathlib(entrada, esperada):
+    caminho = Path(entrada)
+    referencia = caminho.with_name(f"{caminho.stem}_cores{caminho.suffix or '.png'}")
+
+    assert cli.gerar_caminho_saida(caminho, "cores") == Path(esperada) == referencia
+    assert cli.gerar_caminho_saida(caminho, "cores", extensao=".txt") == referencia.with_suffix(".txt")
+
+
+@pytest.mark.parametrize("argv", [["--help"], []])
+def test_help_lists_every_subcommand(capsys, argv):
+    if argv:
+        with pytest.raises(SystemExit) as excinfo:
+            cli.main(argv)
+        assert excinfo.value.code == 0
+    else:
+        cli.main(argv)
+
+    ajuda = capsys.readouterr().out
+    for nome in ("pixelizar", "reduzir", "ampliar", "aproximar-cores", "verificar-cores"):
+        assert nome in ajuda
+
+
+def test_unknown_subcommand_exits_with_usage_error(capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["desconhecido", "--input", "x.png"])
+
+    erro = capsys.readouterr().err
+    assert excinfo.value.code == 2
+    assert "invalid choice: 'desconhecido'" in erro
+    assert "'verificar-cores'" in erro
+
+
+def test_help_does_not_import_heavy_modules():
+    codigo = (
+        "import sys, cli\n"
+        "try:\n"
+        "    cli.main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "pesados = ('PIL', 'numpy', 'processing', 'concurrent.futures', 'multiprocessing')\n"
+        "print(sorted(nome for nome in pesados if nome in sys.modules), file=sys.stderr)\n"
+    )
+    resultado = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=Path(cli.__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert resultado.stderr.strip() == "[]"
+
+
+def test_carregar_imagem_rejects_directory_and_empty_file(tmp_path, capsys):
+    vazio = tmp_path / "vazio.png"
+    vazio.touch()
+
+    assert cli.carregar_imagem(tmp_path) is None
+    assert cli.carregar_imagem(vazio) is None
+
+    erro = capsys.readouterr().err
+    assert "é um diretório" in erro
+    assert "está vazio" in erro
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requer mkfifo")
+def test_fifo_input_is_rejected_without_blocking(tmp_path):
+    fifo = tmp_path / "x.png"
+    os.mkfifo(fifo)
+
+    resultado = subprocess.run(
+        [sys.executable, "cli.py", "reduzir", "--input", str(fifo)],
+        cwd=Path(cli.__file__).parent,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+
+    assert resultado.returncode == 1
+    assert "não é um arquivo regular" in resultado.stderr
+
+
+def test_interactive_failure_exits_with_status_one(tmp_path, monkeypatch, capsys):
+    respostas = iter(["2", str(tmp_path / "nao_existe.png")])
+    monkeypatch.setattr("builtins.input", lambda _mensagem: next(respostas))
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["-I"])
+
+    assert excinfo.value.code == 1
+    assert "não encontrado" in capsys.readouterr().err
+
+
+def test_interactive_success_exits_normally(tmp_path, monkeypatch):
+    entrada = tmp_path / "sprite.png"
+    Image.fromarray(np.zeros((4, 4, 3), dtype=np.uint8)).save(entrada)
+    respostas = iter(["2", str(entrada), "2"])
+    monkeypatch.setattr("builtins.input", lambda _mensagem: next(respostas))
+
+    cli.main(["-I"])
+
+    assert (tmp_path / "sprite_reduzida.png").exists()
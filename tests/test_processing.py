@@ -1,7 +1,11 @@
+import concurrent.futures
+import time
+
 import numpy as np
 import pytest
 from PIL import Image
 
+import processing
 from errors import InvalidParameterError, ProcessingError
 from processing import PixelArtProcessor
 
@@ -32,6 +36,32 @@ def test_detectar_tamanho_and_calcular_blocos():
     assert (largura, altura, media) == (2, 2, 2)
 
 
+@pytest.mark.parametrize(
+    "converter",
+    [lambda a: a, lambda a: a[..., 0], lambda a: a.astype(np.float64)],
+    ids=["rgb", "2d", "float"],
+)
+def test_detectar_tamanho_rectangular_blocks(converter):
+    # Blocos de 2 linhas por 3 colunas, alternando duas cores
+    blocos = np.array([[0, 1], [1, 0]], dtype=np.uint8).repeat(2, axis=0).repeat(3, axis=1)
+    arr = converter(np.stack([blocos * 200] * 3, axis=-1))
+
+    assert PixelArtProcessor.detectar_tamanho(arr, axis=0) == 3
+    assert PixelArtProcessor.detectar_tamanho(arr, axis=1) == 2
+
+
+@pytest.mark.parametrize(
+    ("sequencias", "esperado"), [([2, 3], 2), ([3, 4], 4), ([1, 1, 2], 1)]
+)
+def test_detectar_tamanho_rounds_half_to_even(sequencias, esperado):
+    # Média 2.5 -> 2, 3.5 -> 4 (como ``round``) e 4/3 -> 1
+    linha = np.concatenate(
+        [np.full(n, i % 2, dtype=np.uint8) for i, n in enumerate(sequencias)]
+    )
+
+    assert PixelArtProcessor.detectar_tamanho(linha[None, :], axis=0) == esperado
+
+
 def test_detectar_tamanho_empty_array():
     processor = PixelArtProcessor()
     vazio = np.zeros((0, 0, 3), dtype=np.uint8)
@@ -52,6 +82,104 @@ def test_pixelizar_and_reduzir_and_ampliar(tmp_path):
     assert ampliada.size == (img.width * 2, img.height * 2)
 
 
+def test_pixelizar_matches_three_nearest_passes(tmp_path):
+    # Blocos retangulares forçam a etapa de correção; redimensionamentos
+    # NEAREST não se compõem, então as três etapas não podem virar uma só.
+    rng = np.random.default_rng(3)
+    cores = rng.integers(0, 256, size=(7, 5, 3), dtype=np.uint8)
+    img = Image.fromarray(cores.repeat(2, axis=0).repeat(3, axis=1))
+    processor = PixelArtProcessor()
+
+    pixelizada = processor.pixelizar(img, fator_reducao=2, output_path=tmp_path / "p.png")
+
+    largura, altura, tamanho = processor.calcular_blocos(img)
+    corrigida = img.resize(
+        (round(img.width / largura * tamanho), round(img.height / altura * tamanho)),
+        Image.NEAREST,
+    )
+    reduzida = corrigida.resize(
+        (corrigida.width // 2, corrigida.height // 2), Image.NEAREST
+    )
+    esperada = reduzida.resize(corrigida.size, Image.NEAREST)
+    direta = img.resize(reduzida.size, Image.NEAREST).resize(
+        corrigida.size, Image.NEAREST
+    )
+
+    assert np.array_equal(np.array(pixelizada), np.array(esperada))
+    assert not np.array_equal(np.array(direta), np.array(esperada))
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L", "P"])
+def test_reduzir_and_ampliar_factor_one_keep_pixels(tmp_path, mode):
+    processor = PixelArtProcessor()
+    img = create_block_image(block_size=3).convert(mode)
+
+    reduzida = processor.reduzir(img, fator_reducao=1, output_path=tmp_path / "r.png")
+    ampliada = processor.ampliar(img, fator_aumento=1, output_path=tmp_path / "a.png")
+
+    for resultado in (reduzida, ampliada):
+        assert resultado is not img
+        assert resultado.mode == img.mode
+        assert np.array_equal(np.array(resultado), np.array(img))
+
+
+def test_background_save_writes_file_after_wait(tmp_path):
+    processor = PixelArtProcessor(salvar_em_segundo_plano=True)
+    img = create_block_image(block_size=2)
+    destino = tmp_path / "sub" / "reduzida.png"
+
+    resultado = processor.reduzir(img, 2, output_path=destino)
+    processing.aguardar_salvamentos()
+
+    with Image.open(destino) as salva:
+        assert np.array_equal(np.array(salva), np.array(resultado))
+
+
+def test_background_saves_are_released_unless_they_fail(tmp_path):
+    img = create_block_image(block_size=2)
+    futuros = [
+        processing._agendar_salvamento(img, tmp_path / f"{i}.png") for i in range(5)
+    ]
+    falha = processing._agendar_salvamento(img, tmp_path)  # diretório: falha
+    concurrent.futures.wait(futuros + [falha])
+
+    # Os callbacks rodam logo depois de o futuro ser marcado como concluído.
+    limite = time.monotonic() + 5
+    while len(processing._SALVAMENTOS_PENDENTES) > 1 and time.monotonic() < limite:
+        time.sleep(0.01)
+    assert processing._SALVAMENTOS_PENDENTES == [falha]
+
+    with pytest.raises(ProcessingError):
+        processing.aguardar_salvamentos()
+    assert processing._SALVAMENTOS_PENDENTES == []
+
+
+@pytest.mark.parametrize("fator", [2, 3, 4])
+def test_reduzir_samples_pixels_without_averaging(tmp_path, fator):
+    processor = PixelArtProcessor()
+    rng = np.random.default_rng(fator)
+    arr = rng.integers(0, 256, (fator * 6, fator * 5, 3), dtype=np.uint8)
+
+    reduzida = processor.reduzir(Image.fromarray(arr), fator, output_path=tmp_path / "r.png")
+
+    # NEAREST toma o pixel central de cada bloco; uma média (Image.reduce)
+    # criaria cores que não existem na imagem original.
+    assert np.array_equal(np.array(reduzida), arr[fator // 2 :: fator, fator // 2 :: fator])
+
+
+def test_nivel_compressao_is_validated_and_used(tmp_path):
+    with pytest.raises(InvalidParameterError):
+        PixelArtProcessor(nivel_compressao=10)
+
+    img = create_block_image(block_size=8)
+    rapido = tmp_path / "rapido.png"
+    compacto = tmp_path / "compacto.png"
+    PixelArtProcessor(nivel_compressao=0).ampliar(img, 2, output_path=rapido)
+    PixelArtProcessor(nivel_compressao=9).ampliar(img, 2, output_path=compacto)
+
+    assert compacto.stat().st_size < rapido.stat().st_size
+
+
 def test_pixelizar_invalid_factor():
     processor = PixelArtProcessor()
     img = create_block_image()
@@ -85,6 +213,93 @@ def test_aproximar_cores_replaces_outlier(tmp_path):
     assert np.array_equal(np.array(result)[1, 1], np.array([0, 0, 0]))
 
 
+def test_aproximar_cores_bands_match_single_pass(tmp_path, monkeypatch):
+    processor = PixelArtProcessor()
+    rng = np.random.default_rng(0)
+    img = Image.fromarray(rng.integers(0, 256, (9, 7, 3), dtype=np.uint8))
+    refs = [(0, 0, 0), (255, 255, 255), (200, 30, 30)]
+
+    inteira = processor.aproximar_cores(img, cores_referencia=refs, output_path=tmp_path / "a.png")
+    monkeypatch.setattr(processing, "_PIXELS_POR_FAIXA", 7 * 2)
+    faixas = processor.aproximar_cores(img, cores_referencia=refs, output_path=tmp_path / "b.png")
+    como_array = processor.aproximar_cores(
+        img, cores_referencia=np.array(refs, dtype=np.uint8), output_path=tmp_path / "c.png"
+    )
+
+    assert np.array_equal(np.array(inteira), np.array(faixas))
+    assert np.array_equal(np.array(inteira), np.array(como_array))
+
+    uma_thread = PixelArtProcessor(trabalhadores=1).aproximar_cores(
+        img, cores_referencia=refs, output_path=tmp_path / "d.png"
+    )
+    assert np.array_equal(np.array(inteira), np.array(uma_thread))
+    with pytest.raises(InvalidParameterError):
+        PixelArtProcessor(trabalhadores=0)
+
+
+def test_aproximar_cores_keeps_pixels_within_tolerance_or_threshold(tmp_path):
+    processor = PixelArtProcessor()
+    arr = np.full((3, 3, 3), 128, dtype=np.uint8)
+    arr[1, 1] = (3, 3, 3)  # dentro da tolerância do preto
+    img = Image.fromarray(arr)
+
+    mantida = processor.aproximar_cores(img, tolerancia=5, output_path=tmp_path / "a.png")
+    substituida = processor.aproximar_cores(img, tolerancia=2, output_path=tmp_path / "b.png")
+    abaixo_limiar = processor.aproximar_cores(
+        img, tolerancia=2, limiar_discrepancia=500, output_path=tmp_path / "c.png"
+    )
+
+    assert tuple(np.array(mantida)[1, 1]) == (3, 3, 3)
+    assert tuple(np.array(substituida)[1, 1]) == (255, 255, 255)
+    assert np.array_equal(np.array(abaixo_limiar), arr)
+
+
+@pytest.mark.parametrize("limiar", [float("inf"), float("nan"), 1e200])
+def test_aproximar_cores_unreachable_threshold_keeps_image(tmp_path, limiar):
+    arr = np.zeros((3, 3, 3), dtype=np.uint8)
+    arr[1, 1] = (255, 255, 255)
+    img = Image.fromarray(arr)
+
+    resultado = PixelArtProcessor().aproximar_cores(
+        img, tolerancia=0, limiar_discrepancia=limiar, output_path=tmp_path / "a.png"
+    )
+
+    assert np.array_equal(np.array(resultado), arr)
+
+
+@pytest.mark.parametrize(
+    "refs", [[(0, 0, 0), (2, 0, 0)], [(2, 0, 0), (0, 0, 0)], [(2, 0, 0), (0, 0, 0), (9, 9, 9)]]
+)
+def test_aproximar_cores_tie_keeps_first_reference(tmp_path, refs):
+    processor = PixelArtProcessor()
+    arr = np.zeros((3, 3, 3), dtype=np.uint8)
+    # A média dos vizinhos do centro é (1, 0, 0): equidistante das duas cores.
+    arr[..., 0] = [[0, 2, 0], [2, 50, 2], [0, 2, 0]]
+
+    result = processor.aproximar_cores(
+        Image.fromarray(arr), cores_referencia=refs, tolerancia=0, output_path=tmp_path / "t.png"
+    )
+
+    assert tuple(np.array(result)[1, 1]) == refs[0]
+
+
+def test_aproximar_cores_lab_changes_nearest_reference(tmp_path):
+    processor = PixelArtProcessor()
+    arr = np.zeros((3, 3, 3), dtype=np.uint8)
+    arr[..., 2] = 255  # vizinhos azuis puros
+    arr[1, 1] = (255, 255, 0)
+    img = Image.fromarray(arr)
+    refs = [(0, 0, 128), (100, 100, 255)]
+
+    rgb = processor.aproximar_cores(img, cores_referencia=refs, output_path=tmp_path / "rgb.png")
+    lab = processor.aproximar_cores(
+        img, cores_referencia=refs, output_path=tmp_path / "lab.png", espaco_cor="lab"
+    )
+
+    assert tuple(np.array(rgb)[1, 1]) == (0, 0, 128)
+    assert tuple(np.array(lab)[1, 1]) == (100, 100, 255)
+
+
 def test_aproximar_cores_invalid_parameters():
     processor = PixelArtProcessor()
     img = create_block_image()
@@ -92,6 +307,8 @@ def test_aproximar_cores_invalid_parameters():
         processor.aproximar_cores(img, cores_referencia=[])
     with pytest.raises(InvalidParameterError):
         processor.aproximar_cores(img, tolerancia=-1)
+    with pytest.raises(InvalidParameterError):
+        processor.aproximar_cores(img, espaco_cor="hsv")
 
 
 def test_verificar_cores_counts_and_output(tmp_path):
@@ -105,6 +322,49 @@ def test_verificar_cores_counts_and_output(tmp_path):
     assert (tmp_path / "cores.txt").exists()
 
 
+def test_verificar_cores_orders_by_count_then_first_occurrence():
+    processor = PixelArtProcessor()
+    arr = np.array(
+        [[[0, 0, 255], [255, 0, 0], [0, 255, 0]], [[255, 0, 0], [0, 0, 255], [0, 255, 0]], [[9, 9, 9]] * 3],
+        dtype=np.uint8,
+    )
+
+    resumo = processor.verificar_cores(Image.fromarray(arr))
+
+    assert resumo[1:] == [
+        "#090909 se repetiu 3 vezes",
+        "#0000FF se repetiu 2 vezes",
+        "#FF0000 se repetiu 2 vezes",
+        "#00FF00 se repetiu 2 vezes",
+    ]
+
+
+def test_verificar_cores_paletted_image_matches_rgb():
+    processor = PixelArtProcessor()
+    img = Image.new("P", (3, 2), 0)
+    img.putpalette([255, 0, 0, 0, 0, 255, 255, 0, 0])
+    img.putpixel((0, 0), 1)
+    img.putpixel((1, 0), 2)
+
+    resumo_paleta = processor.verificar_cores(img)
+    resumo_rgb = processor.verificar_cores(img.convert("RGB"))
+
+    assert resumo_paleta == ["Resumo de cores na imagem:", "#FF0000 se repetiu 5 vezes", "#0000FF se repetiu 1 vezes"]
+    assert resumo_paleta == resumo_rgb
+
+
+def test_verificar_cores_paletted_ties_follow_first_occurrence():
+    processor = PixelArtProcessor()
+    img = Image.new("P", (2, 1), 0)
+    img.putpalette([255, 0, 0, 0, 0, 255])
+    img.putpixel((0, 0), 1)
+
+    resumo_paleta = processor.verificar_cores(img)
+
+    assert resumo_paleta[1:] == ["#0000FF se repetiu 1 vezes", "#FF0000 se repetiu 1 vezes"]
+    assert resumo_paleta == processor.verificar_cores(img.convert("RGB"))
+
+
 def test_verificar_cores_invalid_output_path():
     processor = PixelArtProcessor()
     img = create_block_image()
@@ -0,0 +1,88 @@
+import numpy as np
+
+from utils import (
+    cor_referencia_mais_proxima,
+    obter_vizinhos,
+    pixel_fora_da_tolerancia,
+    pixels_fora_da_tolerancia,
+)
+
+
+def test_pixel_fora_da_tolerancia_limits():
+    referencias = [(0, 0, 0), (255, 255, 255)]
+
+    assert not pixel_fora_da_tolerancia((5, 0, 5), referencias, 5)
+    assert pixel_fora_da_tolerancia((6, 0, 0), referencias, 5)
+    assert not pixel_fora_da_tolerancia((250, 255, 252), referencias, 5)
+
+
+def test_pixel_fora_da_tolerancia_numpy_pixel_does_not_wrap():
+    pixel = tuple(np.array([0, 0, 0], dtype=np.uint8))
+
+    assert pixel_fora_da_tolerancia(pixel, [(253, 0, 0)], 5)
+
+
+def test_pixel_fora_da_tolerancia_uint8_references_do_not_wrap():
+    referencias = np.array([(2, 0, 0), (253, 255, 255)], dtype=np.uint8)
+
+    assert not pixel_fora_da_tolerancia((0, 0, 0), referencias, 5)
+    assert not pixel_fora_da_tolerancia((255, 250, 255), referencias, 5)
+    assert pixel_fora_da_tolerancia((10, 0, 0), referencias, 5)
+    assert not pixel_fora_da_tolerancia((0, 0, 0), [tuple(ref) for ref in referencias], 5)
+    assert not pixel_fora_da_tolerancia((255, 250, 255), [tuple(ref) for ref in referencias], 5)
+
+
+def test_cor_referencia_mais_proxima_numpy_base_and_ties():
+    referencias = [(0, 0, 0), (2, 0, 0), (255, 255, 255)]
+
+    assert cor_referencia_mais_proxima(tuple(np.array([1, 0, 0], dtype=np.uint8)), referencias) == (0, 0, 0)
+    assert cor_referencia_mais_proxima(tuple(np.array([0, 200, 200], dtype=np.uint8)), referencias) == (255, 255, 255)
+
+
+def test_cor_referencia_mais_proxima_uint8_references_in_list_do_not_wrap():
+    referencias = [tuple(ref) for ref in np.array([[0, 0, 0], [250, 250, 250]], dtype=np.uint8)]
+
+    assert cor_referencia_mais_proxima((255, 255, 255), referencias) == (250, 250, 250)
+    assert cor_referencia_mais_proxima((3, 0, 0), referencias) == (0, 0, 0)
+
+
+def test_cor_referencia_mais_proxima_array_matches_list():
+    rng = np.random.default_rng(1)
+    referencias = rng.integers(0, 256, (64, 3), dtype=np.uint8)
+    referencias[5] = referencias[9]
+
+    for cor in rng.integers(0, 256, (50, 3), dtype=np.uint8):
+        esperada = cor_referencia_mais_proxima(tuple(cor), [tuple(r) for r in referencias.tolist()])
+        assert cor_referencia_mais_proxima(tuple(cor), referencias) == esperada
+    assert cor_referencia_mais_proxima(tuple(referencias[9]), referencias) == tuple(referencias[5].tolist())
+
+
+def test_obter_vizinhos_order_and_borders():
+    arr = np.arange(27, dtype=np.uint8).reshape(3, 3, 3)
+
+    assert obter_vizinhos(arr, 0, 0) == [(3, 4, 5), (9, 10, 11), (12, 13, 14)]
+    assert len(obter_vizinhos(arr, 1, 1)) == 8
+    assert (12, 13, 14) not in obter_vizinhos(arr, 1, 1)
+
+
+def test_pixels_fora_da_tolerancia_matches_scalar():
+    rng = np.random.default_rng(0)
+    arr = rng.integers(0, 256, (6, 5, 3), dtype=np.uint8)
+    arr[0, 0] = (250, 3, 0)
+    referencias = [(253, 0, 0), (0, 0, 0)]
+
+    mascara = pixels_fora_da_tolerancia(arr, referencias, 5)
+
+    assert mascara.shape == (6, 5)
+    assert not mascara[0, 0]
+    assert mascara.tolist() == [
+        [pixel_fora_da_tolerancia(tuple(pixel), referencias, 5) for pixel in linha] for linha in arr
+    ]
+
+
+def test_pixels_fora_da_tolerancia_uint8_references_do_not_wrap():
+    arr = np.array([[[0, 0, 0], [255, 250, 255], [10, 0, 0]]], dtype=np.uint8)
+    referencias = np.array([[2, 0, 0], [253, 255, 255]], dtype=np.uint8)
+
+    assert pixels_fora_da_tolerancia(arr, referencias, 5).tolist() == [[False, False, True]]
+    assert pixels_fora_da_tolerancia(arr[0, 2], referencias, 5)
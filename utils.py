@@ -7,15 +7,61 @@ import numpy as np
 
 def pixel_fora_da_tolerancia(
     pixel_atual: Tuple[int, int, int],
-    cores_referencia: List[Tuple[int, int, int]],
+    cores_referencia: List[Tuple[int, int, int]] | np.ndarray,
     tolerancia: int,
 ) -> bool:
-    """Indica se o pixel está fora da tolerância das cores de referência."""
+    """Indica se o pixel está fora da tolerância das cores de referência.
 
-    return not any(
-        all(abs(c1 - c2) <= tolerancia for c1, c2 in zip(pixel_atual, ref))
-        for ref in cores_referencia
-    )
+    Cada referência define uma caixa ``[ref - tolerancia, ref + tolerancia]``
+    por canal; a checagem usa comparações encadeadas, sem geradores. Os
+    canais de cada referência viram inteiros do Python antes de calcular os
+    limites, então referências ``uint8`` do NumPy (em array ou em lista) não
+    transbordam.
+    """
+
+    if isinstance(cores_referencia, np.ndarray):
+        cores_referencia = cores_referencia.tolist()
+    vermelho, verde, azul = pixel_atual[0], pixel_atual[1], pixel_atual[2]
+    for ref in cores_referencia:
+        ref_r, ref_g, ref_b = int(ref[0]), int(ref[1]), int(ref[2])
+        if (
+            ref_r - tolerancia <= vermelho <= ref_r + tolerancia
+            and ref_g - tolerancia <= verde <= ref_g + tolerancia
+            and ref_b - tolerancia <= azul <= ref_b + tolerancia
+        ):
+            return False
+    return True
+
+
+def pixels_fora_da_tolerancia(
+    arr: np.ndarray,
+    cores_referencia: List[Tuple[int, int, int]] | np.ndarray,
+    tolerancia: int,
+) -> np.ndarray:
+    """Versão vetorizada de ``pixel_fora_da_tolerancia`` para um array ``(..., 3)``.
+
+    Retorna uma máscara booleana com a forma de ``arr`` sem o eixo dos canais.
+    Os limites de cada caixa são inteiros do Python, então pixels ``uint8``
+    também não transbordam.
+    """
+
+    arr = np.asarray(arr)
+    # Um plano contíguo por canal e um laço por referência e canal, acumulando
+    # em máscaras do tamanho da imagem: nada de temporário (..., K, 3).
+    planos = [arr[..., canal].copy() for canal in range(3)]
+    dentro = np.zeros(arr.shape[:-1], dtype=bool)
+    na_referencia = np.empty_like(dentro)
+    comparacao = np.empty_like(dentro)
+    for ref in cores_referencia:
+        na_referencia.fill(True)
+        for plano, valor in zip(planos, ref):
+            valor = int(valor)
+            np.greater_equal(plano, valor - tolerancia, out=comparacao)
+            na_referencia &= comparacao
+            np.less_equal(plano, valor + tolerancia, out=comparacao)
+            na_referencia &= comparacao
+        dentro |= na_referencia
+    return ~dentro
 
 
 def obter_vizinhos(
@@ -23,41 +69,59 @@ def obter_vizinhos(
     x: int,
     y: int,
 ) -> List[Tuple[int, int, int]]:
-    """Retorna a vizinhança 8 de um pixel em formato de lista RGB."""
+    """Retorna a vizinhança 8 de um pixel em formato de lista RGB.
 
-    altura, largura, _ = arr.shape
-    vizinhos: List[Tuple[int, int, int]] = []
-    for delta_y in [-1, 0, 1]:
-        for delta_x in [-1, 0, 1]:
-            if delta_y == 0 and delta_x == 0:
-                continue
+    A janela 3x3 (já recortada nas bordas) é lida com um único fatiamento e
+    convertida com ``tolist``, sem indexar pixel a pixel.
+    """
 
-            novo_y, novo_x = y + delta_y, x + delta_x
-            if 0 <= novo_y < altura and 0 <= novo_x < largura:
-                vizinhos.append(tuple(arr[novo_y, novo_x]))
+    altura, largura = arr.shape[:2]
+    inicio_y, inicio_x = max(y - 1, 0), max(x - 1, 0)
+    janela = arr[inicio_y : max(y + 2, 0), inicio_x : max(x + 2, 0)]
+    vizinhos: List[Tuple[int, int, int]] = [
+        tuple(pixel) for linha in janela.tolist() for pixel in linha
+    ]
+    if 0 <= y < altura and 0 <= x < largura:
+        del vizinhos[(y - inicio_y) * janela.shape[1] + (x - inicio_x)]
 
     return vizinhos
 
 
 def cor_referencia_mais_proxima(
     cor_base: Tuple[int, int, int],
-    cores_referencia: List[Tuple[int, int, int]],
+    cores_referencia: List[Tuple[int, int, int]] | np.ndarray,
 ) -> Tuple[int, int, int]:
-    """Escolhe a cor de referência mais próxima da cor base."""
-
-    def distancia_cor(
-        cor1: Tuple[int, int, int],
-        cor2: Tuple[int, int, int],
-    ) -> float:
-        diferenca_quadrada = sum(
-            (cor1_valor - cor2_valor) ** 2
-            for cor1_valor, cor2_valor in zip(cor1, cor2)
-        )
-        return float(np.sqrt(diferenca_quadrada))
-
-    distancias: List[float] = [
-        distancia_cor(cor_base, referencia) for referencia in cores_referencia
-    ]
-    indice_menor_distancia = int(np.argmin(distancias))
+    """Escolhe a cor de referência mais próxima da cor base.
+
+    Compara distâncias ao quadrado em inteiros do Python: a raiz não muda qual
+    referência é a menor, e converter os canais (da cor base e de cada
+    referência) evita o transbordamento de escalares ``uint8`` do NumPy. Em
+    empate, vence a primeira referência.
+
+    Paletas grandes podem ser passadas como array ``(N, 3)``: as distâncias
+    são então calculadas de uma vez em ``int64``, sem laço em Python.
+    """
+
+    vermelho, verde, azul = int(cor_base[0]), int(cor_base[1]), int(cor_base[2])
+    if isinstance(cores_referencia, np.ndarray):
+        # Converter uma lista a cada chamada custaria mais que o próprio laço;
+        # o caminho vetorizado só compensa com a paleta já em array.
+        diferenca = cores_referencia[:, :3].astype(np.int64)
+        diferenca -= (vermelho, verde, azul)
+        distancias = np.einsum("ij,ij->i", diferenca, diferenca)
+        return tuple(cores_referencia[int(distancias.argmin())].tolist())
 
-    return cores_referencia[indice_menor_distancia]
+    # Laço explícito em vez de ``min(key=...)``: sem closure criada a cada
+    # chamada nem uma chamada de função por referência.
+    mais_proxima = None
+    menor_distancia = -1
+    for referencia in cores_referencia:
+        delta_r = vermelho - int(referencia[0])
+        delta_g = verde - int(referencia[1])
+        delta_b = azul - int(referencia[2])
+        distancia = delta_r * delta_r + delta_g * delta_g + delta_b * delta_b
+        if mais_proxima is None or distancia < menor_distancia:
+            mais_proxima, menor_distancia = referencia, distancia
+    if mais_proxima is None:
+        raise ValueError("A lista de cores de referência não pode estar vazia.")
+    return mais_proxima